@@ -1,27 +1,43 @@
-try:
-    print("Importing graph_update...")
-    from webapp.callbacks import graph_update
-
-    print("graph_update imported.")
-
-    print("Importing chat_callbacks...")
-    from webapp.callbacks import chat_callbacks
-
-    print("chat_callbacks imported.")
-
-    print("Importing node_rag...")
-    from netmedex import node_rag
-
-    print("node_rag imported.")
-
-    print("Importing graph_rag...")
-    from netmedex import graph_rag
-
-    print("graph_rag imported.")
-
-    print("All imports successful.")
-except Exception as e:
-    print(f"IMPORT ERROR: {e}")
-    import traceback
-
-    traceback.print_exc()
+import importlib
+import sys
+import traceback
+
+# Modules to verify, keyed by the short name accepted on the command line.
+# Each one is only resolved when its check runs, so selecting a single check
+# avoids paying the import cost of the others.
+CHECKS = {
+    "graph_update": "webapp.callbacks.graph_update",
+    "chat_callbacks": "webapp.callbacks.chat_callbacks",
+    "node_rag": "netmedex.node_rag",
+    "graph_rag": "netmedex.graph_rag",
+}
+
+
+def check_import(name: str) -> bool:
+    print(f"Importing {name}...")
+    try:
+        importlib.import_module(CHECKS[name])
+    except Exception as e:
+        print(f"IMPORT ERROR: {e}")
+        traceback.print_exc()
+        return False
+
+    print(f"{name} imported.")
+    return True
+
+
+def main(names: list[str]) -> int:
+    unknown = [name for name in names if name not in CHECKS]
+    if unknown:
+        print(f"Unknown check(s): {', '.join(unknown)}. Choose from: {', '.join(CHECKS)}")
+        return 2
+
+    results = [check_import(name) for name in (names or CHECKS)]
+    if all(results):
+        print("All imports successful.")
+        return 0
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,6 +1,50 @@
+from collections import defaultdict
+
 from webapp.app import app
 
 
+def _output_id(o) -> str:
+    if hasattr(o, "component_id"):
+        return f"{o.component_id}.{o.component_property}"
+    if isinstance(o, dict):
+        return f"{o['id']}.{o['property']}"
+    return str(o)
+
+
+def _extract_out_ids(outputs) -> list[str]:
+    # It might be a list of outputs
+    outs = outputs if isinstance(outputs, list) else [outputs]
+    return [_output_id(o) for o in outs]
+
+
+def build_callback_index(callback_map):
+    """
+    Index callbacks by their inputs and outputs in a single pass.
+
+    Returns (input_index, output_index, out_ids), where the indexes map an
+    "id.property" string to the set of callback ids using it, and out_ids
+    maps each callback id to its output list.
+    """
+    input_index = defaultdict(set)
+    output_index = defaultdict(set)
+    out_ids = {}
+    for callback_id, callback in callback_map.items():
+        for inp in callback["inputs"]:
+            input_index[f"{inp['id']}.{inp['property']}"].add(callback_id)
+        out_ids[callback_id] = _extract_out_ids(callback["output"])
+        for out_id in out_ids[callback_id]:
+            output_index[out_id].add(callback_id)
+    return input_index, output_index, out_ids
+
+
+def find_callbacks(index, inputs=(), outputs=()):
+    """Return the ids of callbacks that use all given inputs and outputs"""
+    input_index, output_index, _ = index
+    candidates = [input_index.get(i, set()) for i in inputs]
+    candidates += [output_index.get(o, set()) for o in outputs]
+    return set.intersection(*candidates) if candidates else set()
+
+
 def verify_callbacks():
     print("Verifying callbacks...")
     # Trigger callback collection
@@ -10,67 +54,29 @@ def verify_callbacks():
 
     collect_callbacks(app)
 
-    found_toggle = False
-    found_switch = False
-
-    for callback_id, callback in app.callback_map.items():
-        inputs = callback["inputs"]
-        outputs = callback["output"]
-
-        # Check for toggle_panels
-        # Input: sidebar-panel-toggle.active_tab
-        has_sidebar_input = any(
-            inp["id"] == "sidebar-panel-toggle" and inp["property"] == "active_tab"
-            for inp in inputs
-        )
-
-        if has_sidebar_input:
-            # Check outputs
-            # It might be a list of outputs
-            outs = outputs if isinstance(outputs, list) else [outputs]
-            out_ids = []
-            for o in outs:
-                if hasattr(o, "component_id"):
-                    out_ids.append(f"{o.component_id}.{o.component_property}")
-                elif isinstance(o, dict):
-                    out_ids.append(f"{o['id']}.{o['property']}")
-                else:
-                    out_ids.append(str(o))
-
-            if "search-panel.style" in out_ids and "chat-panel-container.style" in out_ids:
-                print(f"FOUND: toggle_panels callback. ID: {callback_id}")
-                print(f"  Inputs: {inputs}")
-                print(f"  Outputs: {out_ids}")
-                found_toggle = True
-
-        # Check for switch_to_graph_panel
-        # Input: cy-graph-container.style
-        has_container_input = any(
-            inp["id"] == "cy-graph-container" and inp["property"] == "style" for inp in inputs
-        )
-
-        if has_container_input:
-            outs = outputs if isinstance(outputs, list) else [outputs]
-            # Check if o is dict or object
-            out_ids = []
-            for o in outs:
-                if hasattr(o, "component_id"):
-                    out_ids.append(f"{o.component_id}.{o.component_property}")
-                elif isinstance(o, dict):
-                    out_ids.append(f"{o['id']}.{o['property']}")
-                else:
-                    out_ids.append(str(o))
-
-            if "sidebar-panel-toggle.active_tab" in out_ids:
-                print(f"FOUND: switch_to_graph_panel callback. ID: {callback_id}")
-                print(f"  Inputs: {inputs}")
-                print(f"  Outputs: {out_ids}")
-                found_switch = True
-
-    if not found_toggle:
-        print("ERROR: toggle_panels callback NOT FOUND!")
-    if not found_switch:
-        print("ERROR: switch_to_graph_panel callback NOT FOUND!")
+    index = build_callback_index(app.callback_map)
+    _, _, out_ids = index
+    checks = {
+        "toggle_panels": find_callbacks(
+            index,
+            inputs=["sidebar-panel-toggle.active_tab"],
+            outputs=["search-panel.style", "chat-panel-container.style"],
+        ),
+        "switch_to_graph_panel": find_callbacks(
+            index,
+            inputs=["cy-graph-container.style"],
+            outputs=["sidebar-panel-toggle.active_tab"],
+        ),
+    }
+
+    for name, callback_ids in checks.items():
+        if not callback_ids:
+            print(f"ERROR: {name} callback NOT FOUND!")
+            continue
+        for callback_id in sorted(callback_ids):
+            print(f"FOUND: {name} callback. ID: {callback_id}")
+            print(f"  Inputs: {app.callback_map[callback_id]['inputs']}")
+            print(f"  Outputs: {out_ids[callback_id]}")
 
 
 if __name__ == "__main__":
@@ -2,22 +2,39 @@
 """
 檢查最新生成的圖形文件，查看邊的數據結構
 """
-import pickle
-import glob
-from pathlib import Path
+import os
+
+from netmedex.graph import load_graph
+
+WEBAPP_TEMP_DIR = "/home/cylin/NetMedEx/webapp-temp"
+
+
+def find_latest_pkl(temp_dir):
+    """找到最新的 G.pkl（每個目錄只做一次 stat）"""
+    try:
+        with os.scandir(temp_dir) as it:
+            run_dirs = [(entry.stat().st_mtime, entry.path) for entry in it if entry.is_dir()]
+    except FileNotFoundError:
+        return None
+
+    # 只對最新的候選目錄檢查 G.pkl 是否存在
+    for _, run_dir in sorted(run_dirs, reverse=True):
+        pkl_path = os.path.join(run_dir, "G.pkl")
+        if os.path.exists(pkl_path):
+            return pkl_path
+    return None
+
 
 # 找到最新的 G.pkl
-pkl_files = glob.glob("/home/cylin/NetMedEx/webapp-temp/*/G.pkl")
-if not pkl_files:
+latest_pkl = find_latest_pkl(WEBAPP_TEMP_DIR)
+if latest_pkl is None:
     print("未找到 G.pkl 文件")
     exit(1)
 
-latest_pkl = max(pkl_files, key=lambda x: Path(x).stat().st_mtime)
 print(f"檢查文件: {latest_pkl}\n")
 
-# 加載圖形
-with open(latest_pkl, 'rb') as f:
-    G = pickle.load(f)
+# 加載圖形（load_graph 會處理 GC 暫停與 .zst 壓縮格式）
+G = load_graph(latest_pkl)
 
 print(f"圖形統計:")
 print(f"  節點數: {G.number_of_nodes()}")
@@ -0,0 +1,22 @@
+# Chat classes are resolved on first attribute access so that `import netmedex`
+# (and the CLI paths that never chat) do not pull in the RAG/LLM stack.
+_LAZY_ATTRS = {
+    "ChatMessage": "netmedex.chat",
+    "ChatSession": "netmedex.chat",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        import importlib
+
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
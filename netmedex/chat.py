@@ -9,38 +9,69 @@ and LLM to provide contextualized responses.
 
 import logging
 import re
+import sys
+import time
+from collections import deque
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
+from itertools import islice
 from typing import Any
 
+from netmedex.utils import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Matches citation identifiers like: PMID:123456, [PMID:123456], PMID: 123456
+_PMID_RE = re.compile(r"PMID:?\s*(\d+)", re.IGNORECASE)
+
+# Pronouns and continuation cues that make a question depend on the earlier
+# conversation, e.g. "tell me more" or "what inhibits it?"
+_FOLLOW_UP_RE = re.compile(
+    r"\b(?:it|its|they|them|their|this|that|these|those|more|else|elaborate|continue|"
+    r"expand|above|previous|earlier)\b|更多|繼續|继续|詳細|详细|這個|这个|那個|那个|它|上面|剛才|刚才",
+    re.IGNORECASE,
+)
+
+# Higher token limit for rich multi-section responses
+_CHAT_MAX_TOKENS = 4000
+_CHAT_TIMEOUT = 240.0
+
+# dataclass(slots=True) is only available from Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
-@dataclass
+@dataclass(**_SLOTS)
 class ChatMessage:
     """Represents a single chat message"""
 
     role: str  # "user" or "assistant"
     content: str
     sources: list[str] | None = None  # PMIDs for assistant messages
-    timestamp: str | None = None
+    timestamp: int | None = None  # Epoch time in nanoseconds
     msg_id: str | None = None
 
     def __post_init__(self):
         import uuid
 
         if self.timestamp is None:
-            self.timestamp = datetime.now().isoformat()
+            self.timestamp = time.time_ns()
         if self.msg_id is None:
             self.msg_id = f"msg-{uuid.uuid4().hex[:8]}"
 
+    def isoformat_timestamp(self) -> str:
+        """Format the timestamp as a local ISO 8601 string"""
+        from datetime import datetime
+
+        return datetime.fromtimestamp(self.timestamp / 1e9).isoformat()
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         return {
             "role": self.role,
             "content": self.content,
             "sources": self.sources,
-            "timestamp": self.timestamp,
+            "timestamp": self.isoformat_timestamp(),
             "msg_id": self.msg_id,
         }
 
@@ -63,6 +94,17 @@ class ChatSession:
         self.graph_retriever = graph_retriever
         self.max_history = max_history
         self.history: list[ChatMessage] = []
+        # Pre-built {"role", "content"} dicts for the LLM history window, kept
+        # alongside the full history so _build_messages doesn't rebuild them
+        self._llm_history: deque[dict[str, str]] = deque(
+            maxlen=max_history - 1 if max_history > 1 else None
+        )
+        self._user_count = 0
+        self._assistant_count = 0
+        # (key, text_context, pmids_used) for the small-corpus "use all abstracts" path
+        self._all_context_cache: tuple[tuple, str, list[str]] | None = None
+        # Replies to repeated questions over the same corpus, see _response_cache_key
+        self._response_cache = TTLCache(maxsize=128, ttl=600)
 
         # System prompt for biomedical context
         self.system_prompt = """You are a specialized Biomedical Expert and Research Assistant. Your goal is to provide high-quality, clinical-grade analysis of scientific literature.
@@ -128,6 +170,41 @@ Rely ONLY on the provided context (PMIDs provided below).
 3. Cite PMIDs for EVERY factual claim.
 """
 
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Pickle only the conversation state.
+
+        The RAG system, LLM client and graph retriever wrap vector stores and
+        HTTP clients, so they are dropped; reattach them with attach() after
+        unpickling. Messages are stored as plain tuples.
+        """
+        state = self.__dict__.copy()
+        state["rag"] = state["llm"] = state["graph_retriever"] = None
+        state["history"] = [
+            (msg.role, msg.content, msg.sources, msg.timestamp, msg.msg_id) for msg in self.history
+        ]
+        state["_all_context_cache"] = None
+        for derived in ("_llm_history", "_user_count", "_assistant_count", "_response_cache"):
+            del state[derived]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        history = state.pop("history")
+        self.__dict__.update(state)
+        self.history = []
+        self._llm_history = deque(maxlen=self.max_history - 1 if self.max_history > 1 else None)
+        self._user_count = 0
+        self._assistant_count = 0
+        self._response_cache = TTLCache(maxsize=128, ttl=600)
+        for fields in history:
+            self._append_history(ChatMessage(*fields))
+
+    def attach(self, rag_system, llm_client, graph_retriever=None):
+        """Reattach the services dropped when the session was pickled"""
+        self.rag = rag_system
+        self.llm = llm_client
+        self.graph_retriever = graph_retriever
+
     @staticmethod
     def _looks_like_cjk(text: str) -> bool:
         return any("\u4e00" <= c <= "\u9fff" for c in text)
@@ -257,85 +334,25 @@ Rely ONLY on the provided context (PMIDs provided below).
             Dictionary with response and metadata
         """
         try:
-            # Add user message to history
-            user_msg = ChatMessage(role="user", content=user_message)
-            self.history.append(user_msg)
-
-            entity_listing_kind = self._detect_entity_listing_request(user_message)
-            if entity_listing_kind:
-                listing_response = self._build_entity_listing_response(entity_listing_kind, user_message)
-                if listing_response:
-                    assistant_msg = ChatMessage(
-                        role="assistant",
-                        content=listing_response["content"],
-                        sources=listing_response["sources"],
-                    )
-                    self.history.append(assistant_msg)
-                    return {
-                        "success": True,
-                        "message": assistant_msg.content,
-                        "sources": assistant_msg.sources,
-                        "context_count": listing_response["context_count"],
-                        "user_msg": user_msg,
-                        "assistant_msg": assistant_msg,
-                    }
-
-            # 1. Retrieve Text Context (RAG)
-            # Optimization: If we have a small number of documents (<= 20),
-            # just use all of them instead of vector search. This handles
-            # "summarize all" queries much better.
-            total_docs = len(self.rag.documents)
-            is_local = getattr(self.llm, "provider", "") == "local"
-
-            if total_docs <= 20:
-                logger.info(f"Small document set ({total_docs}), using all abstracts for context")
-                pmids_used = list(self.rag.documents.keys())
-                
-                # Truncate if local to save context window
-                if is_local and total_docs > 8:
-                    logger.info("Local model detected: capping context to 8 abstracts to preserve window")
-                    pmids_used = pmids_used[:8]
-                
-                context_parts = []
-                for pmid in pmids_used:
-                    doc = self.rag.documents[pmid]
-                    context_parts.append(
-                        f"PMID: {pmid}\nTitle: {doc.title}\nAbstract: {doc.abstract}\n"
-                    )
-                text_context = "\n---\n\n".join(context_parts)
-            else:
-                # Use vector search for larger sets - cap top_k for local
-                search_k = min(top_k, 5) if is_local else top_k
-                text_context, pmids_used = self.rag.get_context(user_message, top_k=search_k)
+            cache_key = self._response_cache_key(user_message, top_k, session_language)
+            user_msg, early_result = self._start_turn(user_message, cache_key)
+            if early_result:
+                return early_result
 
-            # 2. Retrieve Graph Context (Structure)
-            graph_context = ""
-            if self.graph_retriever:
-                logger.info("Retrieving graph context...")
-                relevant_nodes = self.graph_retriever.find_relevant_nodes(user_message)
-                if relevant_nodes:
-                    graph_context = self.graph_retriever.get_subgraph_context(relevant_nodes)
-                    logger.info(f"Found {len(relevant_nodes)} relevant nodes in graph")
-                else:
-                    logger.info("No relevant nodes found in graph query")
-
-            # Build conversation history for LLM
-            messages = self._build_messages(
-                user_message, text_context, graph_context, session_language
+            messages, pmids_used = self._prepare_llm_messages(
+                user_message, top_k, session_language
             )
 
             # Call LLM - use unified helper so Gemini uses its HTTP path
             logger.info(f"Sending chat request with {len(pmids_used)} context documents")
-            # Use a higher token limit for rich multi-section responses
-            chat_max_tokens = 4000
             assistant_content = None
             if hasattr(self.llm, "chat_completion_text"):
                 try:
                     assistant_content = self.llm.chat_completion_text(
                         messages=messages,
                         temperature=0.3,
-                        max_tokens=chat_max_tokens,
-                        timeout=240.0,
+                        max_tokens=_CHAT_MAX_TOKENS,
+                        timeout=_CHAT_TIMEOUT,
                     )
                     if assistant_content is not None and not isinstance(assistant_content, str):
                         logger.warning(
@@ -351,48 +368,263 @@ Rely ONLY on the provided context (PMIDs provided below).
                     model=self.llm.model,
                     messages=messages,
                     temperature=0.3,
-                    max_tokens=chat_max_tokens,
+                    max_tokens=_CHAT_MAX_TOKENS,
                 )
                 assistant_content = response.choices[0].message.content
 
-            if assistant_content is None:
-                assistant_content = ""
-            assistant_content = assistant_content.strip()
+            return self._finish_turn(user_msg, assistant_content, pmids_used, cache_key)
 
-            # Parse citations from response to filter sources
-            # Matches identifiers like: PMID:123456, [PMID:123456], PMID: 123456
-            cited_pmids = set(re.findall(r"PMID:?\s*(\d+)", assistant_content, re.IGNORECASE))
+        except Exception as e:
+            logger.error(f"Error generating chat response: {e}")
+            return self._error_result(e)
+
+    def stream_message(
+        self, user_message: str, top_k: int = 5, session_language: str = "English"
+    ) -> Generator[str, None, dict[str, Any]]:
+        """
+        Process user message and stream the AI response as it is generated.
 
-            # Filter pmids_used to only include those actually cited
-            final_sources = [p for p in pmids_used if p in cited_pmids]
+        Yields text chunks as they arrive from the LLM so callers can show
+        the answer before generation finishes. Citation filtering and the
+        history update run once the stream is complete.
+
+        Args:
+            user_message: User's question
+            top_k: Number of abstracts to retrieve for context
+            session_language: Language to enforce for the response
 
-            # Create assistant message with sources
-            assistant_msg = ChatMessage(
-                role="assistant", content=assistant_content, sources=final_sources
+        Returns:
+            The same dictionary as send_message, as the generator's return value
+        """
+        try:
+            cache_key = self._response_cache_key(user_message, top_k, session_language)
+            user_msg, early_result = self._start_turn(user_message, cache_key)
+            if early_result:
+                yield early_result["message"]
+                return early_result
+
+            messages, pmids_used = self._prepare_llm_messages(
+                user_message, top_k, session_language
             )
-            self.history.append(assistant_msg)
 
-            # Skip physical trimming to keep full history for downloads
-            # self._trim_history()
+            logger.info(f"Streaming chat request with {len(pmids_used)} context documents")
+            if hasattr(self.llm, "chat_completion_stream"):
+                stream = self.llm.chat_completion_stream(
+                    messages=messages,
+                    temperature=0.3,
+                    max_tokens=_CHAT_MAX_TOKENS,
+                    timeout=_CHAT_TIMEOUT,
+                )
+            else:
+                stream = (
+                    chunk.choices[0].delta.content
+                    for chunk in self.llm.client.chat.completions.create(
+                        model=self.llm.model,
+                        messages=messages,
+                        temperature=0.3,
+                        max_tokens=_CHAT_MAX_TOKENS,
+                        stream=True,
+                    )
+                    if chunk.choices
+                )
 
-            logger.info("Chat response generated successfully")
+            chunks = []
+            for text in stream:
+                if text:
+                    chunks.append(text)
+                    yield text
 
-            return {
-                "success": True,
-                "message": assistant_content,
-                "sources": final_sources,
-                "context_count": len(pmids_used),
-                "user_msg": user_msg,
-                "assistant_msg": assistant_msg,
-            }
+            return self._finish_turn(user_msg, "".join(chunks), pmids_used, cache_key)
 
         except Exception as e:
-            logger.error(f"Error generating chat response: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-                "message": "Sorry, I encountered an error processing your request.",
-            }
+            logger.error(f"Error streaming chat response: {e}")
+            return self._error_result(e)
+
+    def _start_turn(
+        self, user_message: str, cache_key: tuple | None
+    ) -> tuple[ChatMessage, dict[str, Any] | None]:
+        """
+        Record the user message and answer it without the LLM when possible.
+
+        Entity-listing queries are answered directly from the graph, and a
+        question already answered recently over the same corpus reuses the
+        cached reply.
+        """
+        # Add user message to history
+        user_msg = ChatMessage(role="user", content=user_message)
+        self._append_history(user_msg)
+
+        early_response = None
+        entity_listing_kind = self._detect_entity_listing_request(user_message)
+        if entity_listing_kind:
+            early_response = self._build_entity_listing_response(entity_listing_kind, user_message)
+        if not early_response and cache_key is not None:
+            early_response = self._response_cache.get(cache_key)
+            if early_response:
+                logger.info("Reusing cached response for repeated question")
+        if not early_response:
+            return user_msg, None
+
+        assistant_msg = ChatMessage(
+            role="assistant",
+            content=early_response["content"],
+            sources=list(early_response["sources"]),
+        )
+        self._append_history(assistant_msg)
+        return user_msg, {
+            "success": True,
+            "message": assistant_msg.content,
+            "sources": assistant_msg.sources,
+            "context_count": early_response["context_count"],
+            "user_msg": user_msg,
+            "assistant_msg": assistant_msg,
+        }
+
+    def _response_cache_key(
+        self, user_message: str, top_k: int, session_language: str
+    ) -> tuple | None:
+        """
+        Key replies by question, retrieval settings and corpus version.
+
+        Follow-ups such as "tell me more" depend on the conversation sent along
+        with them, so they are not cached (None) once there is history.
+        """
+        if self._llm_history and _FOLLOW_UP_RE.search(user_message):
+            return None
+        corpus_version = (id(self.rag), self.rag.documents_version) if self.rag else None
+        return (user_message, top_k, session_language, corpus_version)
+
+    def _prepare_llm_messages(
+        self, user_message: str, top_k: int, session_language: str
+    ) -> tuple[list[dict], list[str]]:
+        """Retrieve text and graph context and build the LLM message list"""
+        # Text and graph retrieval are independent, so run the graph lookup
+        # in a worker thread while the text context is retrieved here.
+        if self.graph_retriever:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                graph_future = executor.submit(self._retrieve_graph_context, user_message)
+                text_context, pmids_used = self._retrieve_text_context(user_message, top_k)
+                graph_context = graph_future.result()
+        else:
+            text_context, pmids_used = self._retrieve_text_context(user_message, top_k)
+            graph_context = ""
+
+        # Build conversation history for LLM
+        messages = self._build_messages(user_message, text_context, graph_context, session_language)
+        return messages, pmids_used
+
+    def _retrieve_text_context(self, user_message: str, top_k: int) -> tuple[str, list[str]]:
+        """Retrieve Text Context (RAG)"""
+        # Optimization: If we have a small number of documents (<= 20),
+        # just use all of them instead of vector search. This handles
+        # "summarize all" queries much better.
+        total_docs = len(self.rag.documents)
+        is_local = getattr(self.llm, "provider", "") == "local"
+
+        if total_docs <= 20:
+            logger.info(f"Small document set ({total_docs}), using all abstracts for context")
+
+            # Truncate if local to save context window
+            limit = None
+            if is_local and total_docs > 8:
+                logger.info("Local model detected: capping context to 8 abstracts to preserve window")
+                limit = 8
+
+            return self._get_all_documents_context(limit)
+
+        # Use vector search for larger sets - cap top_k for local
+        search_k = min(top_k, 5) if is_local else top_k
+        return self.rag.get_context(user_message, top_k=search_k)
+
+    def _retrieve_graph_context(self, user_message: str) -> str:
+        """Retrieve Graph Context (Structure)"""
+        logger.info("Retrieving graph context...")
+        relevant_nodes = self.graph_retriever.find_relevant_nodes(user_message)
+        if not relevant_nodes:
+            logger.info("No relevant nodes found in graph query")
+            return ""
+
+        logger.info(f"Found {len(relevant_nodes)} relevant nodes in graph")
+        return self.graph_retriever.get_subgraph_context(relevant_nodes)
+
+    def _finish_turn(
+        self,
+        user_msg: ChatMessage,
+        assistant_content: str | None,
+        pmids_used: list[str],
+        cache_key: tuple | None = None,
+    ) -> dict[str, Any]:
+        """Filter cited sources, record the assistant reply and build the result dict"""
+        assistant_content = (assistant_content or "").strip()
+
+        # Parse citations from response to filter sources
+        final_sources = self._filter_cited_sources(assistant_content, pmids_used)
+        if cache_key is not None and assistant_content:
+            self._response_cache.set(
+                cache_key,
+                {
+                    "content": assistant_content,
+                    "sources": tuple(final_sources),
+                    "context_count": len(pmids_used),
+                },
+            )
+
+        # Create assistant message with sources
+        assistant_msg = ChatMessage(role="assistant", content=assistant_content, sources=final_sources)
+        self._append_history(assistant_msg)
+
+        # Full history is kept for downloads; the LLM window is bounded by _llm_history
+
+        logger.info("Chat response generated successfully")
+
+        return {
+            "success": True,
+            "message": assistant_content,
+            "sources": final_sources,
+            "context_count": len(pmids_used),
+            "user_msg": user_msg,
+            "assistant_msg": assistant_msg,
+        }
+
+    @staticmethod
+    def _error_result(error: Exception) -> dict[str, Any]:
+        return {
+            "success": False,
+            "error": str(error),
+            "message": "Sorry, I encountered an error processing your request.",
+        }
+
+    def _get_all_documents_context(self, limit: int | None = None) -> tuple[str, list[str]]:
+        """
+        Format every indexed abstract (up to *limit*) as LLM context.
+
+        The result is cached until the document set changes, since the corpus
+        normally stays fixed for the lifetime of a session.
+        """
+        documents = self.rag.documents
+        key = (limit, tuple(documents), tuple(map(id, documents.values())))
+        if self._all_context_cache is None or self._all_context_cache[0] != key:
+            items = list(islice(documents.items(), limit))
+            pmids_used = [pmid for pmid, _ in items]
+            text_context = "\n---\n\n".join(
+                f"PMID: {pmid}\nTitle: {doc.title}\nAbstract: {doc.abstract}\n"
+                for pmid, doc in items
+            )
+            self._all_context_cache = (key, text_context, pmids_used)
+
+        _, text_context, pmids_used = self._all_context_cache
+        return text_context, list(pmids_used)
+
+    @staticmethod
+    def _filter_cited_sources(content: str, pmids_used: list) -> list:
+        """Keep only the context PMIDs that are actually cited in *content*."""
+        cited = _PMID_RE.findall(content)
+        if not cited:
+            return []
+
+        # Compare normalized strings so int PMIDs or zero-padded citations still match
+        cited_pmids = {c.lstrip("0") or "0" for c in cited}
+        return [p for p in pmids_used if (str(p).lstrip("0") or "0") in cited_pmids]
 
     def _build_messages(
         self,
@@ -410,22 +642,19 @@ Rely ONLY on the provided context (PMIDs provided below).
 
         # Add recent conversation history (excluding current message)
         # Prevents accidental consecutive repetition
-        # Use a sliding window for context (max_history - 1)
+        # The sliding window (max_history - 1) is maintained by self._llm_history
         last_added_content = None
-        history_window = (
-            self.history[-(self.max_history - 1) :] if self.max_history > 0 else self.history
-        )
-
-        for msg in history_window:
-            if msg.role == "system":
+        for msg in self._llm_history:
+            content = msg["content"]
+            if msg["role"] == "system":
                 continue
-            if msg.content == user_message:
+            if content == user_message:
                 continue
-            if msg.content == last_added_content:
+            if content == last_added_content:
                 continue
 
-            messages.append({"role": msg.role, "content": msg.content})
-            last_added_content = msg.content
+            messages.append(msg)
+            last_added_content = content
 
         # Add current message with Hybrid RAG context
         current_message = f"""Context 1: Knowledge Graph Structure (Logic & Paths):
@@ -451,27 +680,32 @@ CRITICAL RULE: You MUST respond entirely in {session_language}."""
 
         return messages
 
-    def _trim_history(self):
-        """Trim conversation history to max length"""
-        if len(self.history) > self.max_history:
-            # Keep the most recent messages
-            self.history = self.history[-self.max_history :]
-            logger.debug(f"Trimmed chat history to {self.max_history} messages")
+    def _append_history(self, msg: ChatMessage):
+        """Record a message in the full history and the LLM history window"""
+        self.history.append(msg)
+        self._llm_history.append({"role": msg.role, "content": msg.content})
+        if msg.role == "user":
+            self._user_count += 1
+        elif msg.role == "assistant":
+            self._assistant_count += 1
 
     def get_history(self) -> list[dict]:
         """Get conversation history as list of dictionaries"""
-        return [msg.to_dict() for msg in self.history]
+        return list(map(ChatMessage.to_dict, self.history))
 
     def clear(self):
         """Clear conversation history"""
         self.history.clear()
+        self._llm_history.clear()
+        self._user_count = 0
+        self._assistant_count = 0
         logger.info("Chat history cleared")
 
     def get_stats(self) -> dict[str, Any]:
         """Get statistics about the chat session"""
         return {
             "message_count": len(self.history),
-            "user_messages": sum(1 for msg in self.history if msg.role == "user"),
-            "assistant_messages": sum(1 for msg in self.history if msg.role == "assistant"),
+            "user_messages": self._user_count,
+            "assistant_messages": self._assistant_count,
             "indexed_pmids": len(self.rag.get_all_pmids()) if self.rag else 0,
         }
@@ -9,7 +9,7 @@ from netmedex.graph import PubTatorGraphBuilder
 from netmedex.graph_rag import GraphRetriever
 from netmedex.node_rag import GraphNode, NodeRAG
 from netmedex.pubtator import PubTatorAPI
-from netmedex.rag import AbstractDocument, AbstractRAG
+from netmedex.rag import AbstractDocument, AbstractRAG, SharedEmbedder
 from webapp.llm import LLMClient
 
 
@@ -97,12 +97,14 @@ class NetMedExChatBridge:
             for pmid in pmids
         ]
 
-        rag_system = AbstractRAG(self.llm_client)
+        # Both retrievers are searched with the same question; embed it once
+        embedder = SharedEmbedder()
+        rag_system = AbstractRAG(self.llm_client, embedder=embedder)
         indexed_count = rag_system.index_abstracts(documents)
 
         node_rag = None
         try:
-            node_rag = NodeRAG(self.llm_client)
+            node_rag = NodeRAG(self.llm_client, embedder=embedder)
             graph_nodes = [
                 GraphNode(
                     node_id=str(node_id),
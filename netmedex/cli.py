@@ -254,7 +254,7 @@ def chat_entry(args):
     from netmedex.graph import load_graph
     from netmedex.graph_rag import GraphRetriever
     from netmedex.node_rag import GraphNode, NodeRAG
-    from netmedex.rag import AbstractDocument, AbstractRAG
+    from netmedex.rag import AbstractDocument, AbstractRAG, SharedEmbedder
 
     debug = args.debug
     logfile_name = "chat" if debug else None
@@ -322,12 +322,14 @@ def chat_entry(args):
             )
         )
 
-    rag_system = AbstractRAG(llm_client)
+    # Both retrievers are searched with the same question; embed it once
+    embedder = SharedEmbedder()
+    rag_system = AbstractRAG(llm_client, embedder=embedder)
     indexed_count = rag_system.index_abstracts(documents)
 
     node_rag = None
     try:
-        node_rag = NodeRAG(llm_client)
+        node_rag = NodeRAG(llm_client, embedder=embedder)
         graph_nodes = []
         for node_id, data in G.nodes(data=True):
             graph_nodes.append(
@@ -398,13 +400,14 @@ def chat_entry(args):
             )
             continue
 
-        result = session.send_message(
-            user_input,
-            top_k=args.top_k,
-            session_language=args.session_language,
+        result = _print_chat_stream(
+            session.stream_message(
+                user_input,
+                top_k=args.top_k,
+                session_language=args.session_language,
+            )
         )
         if result["success"]:
-            print(f"\n{result['message']}")
             if result.get("sources"):
                 print(f"\nSources: {', '.join(result['sources'])}")
             print("")
@@ -412,6 +415,17 @@ def chat_entry(args):
             print(f"Error: {result.get('error', 'Unknown chat error')}")
 
 
+def _print_chat_stream(stream) -> dict:
+    """Print streamed chat chunks as they arrive and return the final result dict"""
+    print("")
+    while True:
+        try:
+            print(next(stream), end="", flush=True)
+        except StopIteration as stop:
+            print("")
+            return stop.value
+
+
 def parse_args(args):
     parser = argparse.ArgumentParser()
     subparser = parser.add_subparsers()
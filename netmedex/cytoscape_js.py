@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import gzip
 import json
 import logging
 import re
 import time
+from collections.abc import Iterable, Iterator
+from functools import lru_cache, partial
+from itertools import chain
 from typing import Literal
 
 import networkx as nx
 
-from netmedex.cytoscape_html_template import HTML_TEMPLATE
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is installed along with chromadb
+    orjson = None
+
+from netmedex.cytoscape_html_template import render_stream
 from netmedex.relation_types import (
     is_directional_relation,
     get_relation_display_name,
@@ -18,19 +27,63 @@ from netmedex.relation_types import (
 logger = logging.getLogger(__name__)
 
 SHAPE_JS_MAP = {"PARALLELOGRAM": "RHOMBOID"}
+_SHAPE_JS_MAP_LOWER = {k: v.lower() for k, v in SHAPE_JS_MAP.items()}
 COMMUNITY_NODE_PATTERN = re.compile(r"^c\d+$")
 
+# The relation vocabulary is small, so every edge after the first few hits these caches
+_normalize_relation = lru_cache(maxsize=256)(normalize_relation_type)
+_is_directional = lru_cache(maxsize=256)(is_directional_relation)
+_display_name = lru_cache(maxsize=256)(get_relation_display_name)
+
+
+def _json_default(obj):
+    # Only called for types the encoder can't handle natively
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to UTF-8 JSON, with orjson when it is available."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+    return json.dumps(obj, default=_json_default).encode("utf-8")
 
-def save_as_html(G: nx.Graph, savepath: str, layout="preset"):
-    with open(savepath, "w") as f:
-        cytoscape_js = create_cytoscape_js(G, style="cyjs")
-        f.write(HTML_TEMPLATE.format(cytoscape_js=json.dumps(cytoscape_js), layout=layout))
+
+def _iter_json_array(items: Iterable) -> Iterator[bytes]:
+    """
+    Encode `items` as a JSON array one item at a time, so each element can be
+    freed as soon as it is written and the full document is never in memory.
+    """
+    yield b"["
+    for i, item in enumerate(items):
+        yield b"," + _dumps(item) if i else _dumps(item)
+    yield b"]"
+
+
+def save_as_html(G: nx.Graph, savepath: str):
+    """Save the graph as a standalone HTML page, gzip-compressed if `savepath` ends in .gz."""
+    nodes, edges = _cytoscape_elements(G)
+    if str(savepath).endswith(".gz"):
+        opener = partial(gzip.open, compresslevel=6)
+    else:
+        opener = open
+    with opener(savepath, "wb") as f:
+        render_stream(f, _iter_json_array(chain(nodes, edges)))
 
 
 def save_as_json(G: nx.Graph, savepath: str):
-    with open(savepath, "w") as f:
-        cytoscape_js = create_cytoscape_js(G, style="dash")
-        f.write(json.dumps(cytoscape_js))
+    nodes, edges = _cytoscape_elements(G)
+    with open(savepath, "wb") as f:
+        f.write(b'{"elements":{"nodes":')
+        f.writelines(_iter_json_array(nodes))
+        f.write(b',"edges":')
+        f.writelines(_iter_json_array(edges))
+        f.write(b"}}")
 
 
 def create_cytoscape_js(G: nx.Graph, style: Literal["dash", "cyjs"] = "cyjs"):
@@ -40,15 +93,41 @@ def create_cytoscape_js(G: nx.Graph, style: Literal["dash", "cyjs"] = "cyjs"):
     start_t = time.time()
     print(f"\n>>> [CYJS-DEBUG] Starting export at {start_t}")
 
+    nodes, edges = _cytoscape_elements(G)
+    nodes_json = list(nodes)
+    edges_json = list(edges)
+
+    print(f">>> [CYJS-DEBUG] Export finished in {time.time() - start_t:.4f}s")
+
+    if style == "cyjs":
+        return nodes_json + edges_json
+    return {"elements": {"nodes": nodes_json, "edges": edges_json}}
+
+
+def _cytoscape_elements(G: nx.Graph) -> tuple[Iterator[dict], Iterator[dict]]:
+    """
+    Validate the graph and return its nodes and edges as Cytoscape elements.
+
+    Validation runs eagerly; the elements themselves are created lazily so
+    that file exports can encode and discard them one at a time. Edges come
+    back as a list when they were converted in a process pool.
+    """
     # Track exactly which node IDs (UUIDs) we are sending to the browser
     final_node_uuids = set()
-    valid_nodes_for_export = []
+    # Degree of each exported node, keyed by node ID in export order. This also
+    # serves as the list of valid nodes, so no separate pass computes degrees
+    node_degrees = {}
+    degree = G.degree
 
     skipped_missing_id = 0
     skipped_duplicates = 0
 
+    # Attribute dicts of every node, so edges below don't go through G.nodes[...]
+    node_attr_map = {}
+
     # 1. Collect and Validate Nodes
     for node_id, node_attr in G.nodes(data=True):
+        node_attr_map[node_id] = node_attr
         uuid = node_attr.get("_id")
         if not uuid:
             print(f">>> [CYJS-DEBUG] Skipping node {node_id}: No '_id' attribute.")
@@ -65,37 +144,40 @@ def create_cytoscape_js(G: nx.Graph, style: Literal["dash", "cyjs"] = "cyjs"):
             continue
 
         final_node_uuids.add(uuid)
-        valid_nodes_for_export.append((node_id, node_attr))
+        node_degrees[node_id] = degree(node_id)
 
     # 2. Collect and Filter Edges
     valid_edges_for_export = []
     skipped_missing_source = 0
     skipped_missing_target = 0
 
-    for u, v, edge_attr in G.edges(data=True):
-        source_uuid = G.nodes[u].get("_id")
-        target_uuid = G.nodes[v].get("_id")
+    if not skipped_missing_id and not skipped_duplicates:
+        # Every node made it into the export, so every edge has both endpoints
+        valid_edges_for_export = list(G.edges(data=True))
+    else:
+        for u, v, edge_attr in G.edges(data=True):
+            source_uuid = node_attr_map[u].get("_id")
+            target_uuid = node_attr_map[v].get("_id")
 
-        if not source_uuid or source_uuid not in final_node_uuids:
-            skipped_missing_source += 1
-            # print(f">>> [CYJS-DEBUG] Edge filtered: source {source_uuid} not in nodes.")
-            continue
+            if not source_uuid or source_uuid not in final_node_uuids:
+                skipped_missing_source += 1
+                # print(f">>> [CYJS-DEBUG] Edge filtered: source {source_uuid} not in nodes.")
+                continue
 
-        if not target_uuid or target_uuid not in final_node_uuids:
-            skipped_missing_target += 1
-            # print(f">>> [CYJS-DEBUG] Edge filtered: target {target_uuid} not in nodes.")
-            continue
+            if not target_uuid or target_uuid not in final_node_uuids:
+                skipped_missing_target += 1
+                # print(f">>> [CYJS-DEBUG] Edge filtered: target {target_uuid} not in nodes.")
+                continue
 
-        valid_edges_for_export.append((u, v, edge_attr))
+            valid_edges_for_export.append((u, v, edge_attr))
 
     print(
-        f">>> [CYJS-DEBUG] Summary: Nodes({len(valid_nodes_for_export)}), Edges({len(valid_edges_for_export)}). "
+        f">>> [CYJS-DEBUG] Summary: Nodes({len(node_degrees)}), Edges({len(valid_edges_for_export)}). "
         f"Filtered: MissingID={skipped_missing_id}, Dups={skipped_duplicates}, "
         f"NoSource={skipped_missing_source}, NoTarget={skipped_missing_target}"
     )
 
-    # Calculate node degrees for sizing
-    node_degrees = {node_id: G.degree(node_id) for node_id, _ in valid_nodes_for_export}
+    # Node sizes scale with degree
     if node_degrees:
         min_deg = min(node_degrees.values())
         max_deg = max(node_degrees.values())
@@ -104,37 +186,42 @@ def create_cytoscape_js(G: nx.Graph, style: Literal["dash", "cyjs"] = "cyjs"):
 
     MIN_SIZE, MAX_SIZE = 25, 65
 
-    def get_node_size(nid):
-        deg = node_degrees.get(nid, 0)
+    def get_node_size(deg):
         if max_deg == min_deg:
             return MIN_SIZE
         norm = (deg - min_deg) / (max_deg - min_deg)
         return MIN_SIZE + (norm * (MAX_SIZE - MIN_SIZE))
 
     # Convert to Cytoscape format
-    nodes_json = [
-        create_cytoscape_node(
-            (nid, attr), size=get_node_size(nid), degree=node_degrees.get(nid, 0)
-        )
-        for nid, attr in valid_nodes_for_export
-    ]
-    edges_json = [
-        create_cytoscape_edge((u, v, attr), G, with_id=True)
-        for u, v, attr in valid_edges_for_export
-    ]
+    nodes = (
+        create_cytoscape_node((nid, node_attr_map[nid]), size=get_node_size(deg), degree=deg)
+        for nid, deg in node_degrees.items()
+    )
+    edges = (
+        create_cytoscape_edge(edge, node_attr_map, with_id=True) for edge in valid_edges_for_export
+    )
 
-    print(f">>> [CYJS-DEBUG] Export finished in {time.time() - start_t:.4f}s")
+    return nodes, edges
 
-    if style == "cyjs":
-        return nodes_json + edges_json
-    return {"elements": {"nodes": nodes_json, "edges": edges_json}}
+
+def _round3(value) -> float:
+    """
+    round(value, 3) for layout coordinates. These are usually numpy floats, and
+    numpy's __round__ is an order of magnitude slower than this plain-float
+    version of the same scale/round-half-even/unscale computation.
+    """
+    return round(float(value) * 1000) / 1000
 
 
-def create_cytoscape_node(node, size=25, degree=0):
-    def convert_shape(shape):
-        return SHAPE_JS_MAP.get(shape, shape).lower()
+def _is_community_node(node_id: str) -> bool:
+    """Same test as COMMUNITY_NODE_PATTERN ("c" followed by digits) without the regex engine."""
+    return len(node_id) > 1 and node_id[0] == "c" and node_id[1:].isdecimal()
 
+
+def create_cytoscape_node(node, size=25, degree=0):
     node_id, node_attr = node
+    shape = node_attr["shape"]
+    pos = node_attr.get("pos")
     node_info = {
         "data": {
             "id": node_attr["_id"],
@@ -142,7 +229,7 @@ def create_cytoscape_node(node, size=25, degree=0):
             "color": node_attr["color"],
             "label_color": node_attr["label_color"],
             "label": node_attr["name"],
-            "shape": convert_shape(node_attr["shape"]),
+            "shape": _SHAPE_JS_MAP_LOWER.get(shape) or shape.lower(),
             "pmids": list(node_attr["pmids"]),
             "num_articles": node_attr["num_articles"],
             "standardized_id": node_attr["mesh"],
@@ -151,84 +238,94 @@ def create_cytoscape_node(node, size=25, degree=0):
             "degree": degree,
         },
         "position": {
-            "x": round(node_attr["pos"][0], 3) if "pos" in node_attr else 0,
-            "y": round(node_attr["pos"][1], 3) if "pos" in node_attr else 0,
+            "x": _round3(pos[0]) if pos is not None else 0,
+            "y": _round3(pos[1]) if pos is not None else 0,
         },
     }
 
-    if COMMUNITY_NODE_PATTERN.search(str(node_id)):
+    if _is_community_node(str(node_id)):
         node_info["classes"] = "top-center"
 
     return node_info
 
 
-def _convert_sets_to_lists(obj):
-    if isinstance(obj, set):
-        return list(obj)
-    elif isinstance(obj, dict):
-        return {k: _convert_sets_to_lists(v) for k, v in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [_convert_sets_to_lists(item) for item in obj]
-    return obj
-
-
 def _extract_primary_relation(edge_attr: dict) -> tuple[str, float]:
+    # Community edges only aggregate PMIDs and carry no relations
+    if edge_attr.get("type") == "community":
+        return "interacts_with", 0.0
+
     if "confidences" in edge_attr and edge_attr["confidences"]:
-        relation_confidences = {}
+        # Running (sum, count) per relation; the relation with the highest mean wins
+        stats = {}
         for pmid_confidences in edge_attr["confidences"].values():
             for relation, confidence in pmid_confidences.items():
-                if relation not in relation_confidences:
-                    relation_confidences[relation] = []
-                relation_confidences[relation].append(confidence)
-        avg_confidences = {
-            rel: sum(confs) / len(confs) for rel, confs in relation_confidences.items()
-        }
-        if avg_confidences:
+                total, count = stats.get(relation, (0.0, 0))
+                stats[relation] = (total + confidence, count + 1)
+        if stats:
+            avg_confidences = {rel: total / count for rel, (total, count) in stats.items()}
             primary_relation = max(avg_confidences, key=avg_confidences.get)
-            return normalize_relation_type(primary_relation), avg_confidences[primary_relation]
+            return _normalize_relation(primary_relation), avg_confidences[primary_relation]
 
     if "relations" in edge_attr and edge_attr["relations"]:
-        all_relations = set()
+        # The first relation other than co-mention wins, so there is no need to
+        # collect them all; co-mention is only used if it is all there is
+        saw_co_mention = False
         for relations in edge_attr["relations"].values():
-            if isinstance(relations, (set, list)):
-                all_relations.update(relations)
-            elif isinstance(relations, str):
-                all_relations.add(relations)
-
-        if len(all_relations) > 1 and "co-mention" in all_relations:
-            all_relations.remove("co-mention")
-
-        if all_relations:
-            for rel in all_relations:
+            # Exact type checks: the builder only stores sets, lists or strings
+            kind = type(relations)
+            if kind is str:
+                relations = (relations,)
+            elif kind is not set and kind is not list:
+                continue
+            for rel in relations:
                 if rel != "co-mention":
-                    return normalize_relation_type(rel), 0.5
-            return normalize_relation_type(list(all_relations)[0]), 0.5
+                    return _normalize_relation(rel), 0.5
+                saw_co_mention = True
+
+        if saw_co_mention:
+            return _normalize_relation("co-mention"), 0.5
 
     return "interacts_with", 0.0
 
 
-def create_cytoscape_edge(edge, G, with_id=True):
+def create_cytoscape_edge(edge, node_attr_map, with_id=True):
+    """
+    Convert a graph edge to a Cytoscape element.
+
+    `node_attr_map` maps node IDs to their attribute dicts, e.g. `G.nodes`
+    or a plain dict built from it.
+    """
     node_id_1, node_id_2, edge_attr = edge
     if edge_attr["type"] == "community":
-        pmids = list(edge_attr["pmids"])
+        pmids = edge_attr["pmids"]
+        # Reuse a list as is; sets (the builder's default) still need converting
+        if type(pmids) is not list:
+            pmids = list(pmids)
     else:
         pmids = list(edge_attr["relations"].keys())
 
     primary_relation, confidence = _extract_primary_relation(edge_attr)
-    is_directional = is_directional_relation(primary_relation)
-    relation_display = get_relation_display_name(primary_relation)
+    is_directional = _is_directional(primary_relation)
+    relation_display = _display_name(primary_relation)
 
-    source_id = G.nodes[node_id_1]["_id"]
-    target_id = G.nodes[node_id_2]["_id"]
-    source_name = G.nodes[node_id_1]["name"]
-    target_name = G.nodes[node_id_2]["name"]
+    node_1 = node_attr_map[node_id_1]
+    node_2 = node_attr_map[node_id_2]
+    source_id = node_1["_id"]
+    target_id = node_2["_id"]
+    source_name = node_1["name"]
+    target_name = node_2["name"]
 
     if "source_id" in edge_attr:
         if edge_attr["source_id"] != node_id_1:
             source_id, target_id = target_id, source_id
             source_name, target_name = target_name, source_name
 
-    relations = _convert_sets_to_lists(edge_attr.get("relations", {}))
+    # relations is {pmid: set of relation types}. Dash serializes the elements
+    # itself, so the sets are converted here rather than in _dumps
+    relations = {
+        pmid: list(rels) if isinstance(rels, set) else rels
+        for pmid, rels in edge_attr.get("relations", {}).items()
+    }
 
     edge_data = {
         "source": source_id,
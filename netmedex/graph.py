@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import gc
+import heapq
 import importlib
+import io
 import logging
 import math
 import pickle
+import random
+import sys
 from collections import defaultdict
-from collections.abc import Mapping, Sequence
-from dataclasses import asdict
+from collections.abc import Callable, Collection, Mapping, Sequence
+from itertools import combinations, repeat
 from operator import itemgetter
 from pathlib import Path
 from typing import Literal
@@ -21,7 +26,7 @@ from netmedex.graph_data import (
     GraphNode,
 )
 from netmedex.headers import HEADERS
-from netmedex.npmi import normalized_pointwise_mutual_information
+from netmedex.npmi import normalized_pointwise_mutual_information_array
 from netmedex.pubtator_data import (
     PubTatorArticle,
     PubTatorCollection,
@@ -41,8 +46,28 @@ except ImportError:
     SemanticRelationshipExtractor = None
 from netmedex.utils import generate_stable_id
 
+try:
+    import igraph as ig
+except ImportError:
+    # igraph is optional; community detection falls back to NetworkX
+    ig = None
+
+try:
+    import graph_tool.all as gt
+except ImportError:
+    # graph-tool is optional; layout falls back to NetworkX
+    gt = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    # zstandard is optional; only needed for .zst graph pickles
+    zstd = None
+
 MIN_EDGE_WIDTH = 1.0
 MAX_EDGE_WIDTH = 20
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZSTD_LEVEL = 3
 
 
 logger = logging.getLogger(__name__)
@@ -113,6 +138,9 @@ class PubTatorGraphBuilder:
     ) -> None:
         self.node_type = node_type
         self.edge_method = edge_method
+        # Resolved once so article ingestion does not re-dispatch on edge_method.
+        # None for semantic edges, which need the LLM extractor
+        self._edge_builder = _ARTICLE_EDGE_BUILDERS.get(edge_method)
         self._mesh_only = node_type in ("mesh", "relation")
         self.num_articles = 0
         self.graph = nx.Graph()
@@ -204,41 +232,22 @@ class PubTatorGraphBuilder:
         self.num_articles += 1
         self._updated = True
 
-        node_collection = PubTatorNodeCollection(
-            mesh_only=self._mesh_only, use_mesh_vocabulary=use_mesh_vocabulary
+        nodes, edges = _collect_article_graph(
+            article,
+            mesh_only=self._mesh_only,
+            use_mesh_vocabulary=use_mesh_vocabulary,
+            edge_builder=self._edge_builder if compute_edges else None,
         )
-        for annotation in article.annotations:
-            node_collection.add_node(annotation)
-
-        edges = []
-
-        # Edge creation based on selected method
-        # Edge creation based on selected method
-        if compute_edges:
-            if self.edge_method == "co-occurrence":
-                # Co-occurrence method: create edges for all co-occurring entities
-                edges += self._create_complete_graph_edges(
-                    list(node_collection.nodes.keys()), article.pmid
-                )
-
-            elif self.edge_method == "semantic":
-                # Semantic analysis method: use LLM to identify meaningful relationships
-                # Only use semantic edges, do not add BioREx relations
-                edges += self._create_semantic_edges(
-                    article, node_collection.nodes, self.num_articles
-                )
-
-            elif self.edge_method == "relation":
-                # Relation-only method: only use BioREx annotated relations
-                edges += self._create_relation_edges(
-                    list(node_collection.mesh_nodes.keys()), article.relations
-                )
+        if compute_edges and self.edge_method == "semantic":
+            # Semantic analysis method: use LLM to identify meaningful relationships
+            # Only use semantic edges, do not add BioREx relations
+            edges = self._create_semantic_edges(article, nodes, self.num_articles)
 
         self._add_attributes(article)
-        self._add_nodes(node_collection.nodes)
+        self._add_nodes(nodes)
         self._add_edges(edges)
 
-        return node_collection.nodes
+        return nodes
 
     def build(
         self,
@@ -247,6 +256,8 @@ class PubTatorGraphBuilder:
         edge_weight_cutoff: int = 0,
         community: bool = True,
         max_edges: int = 0,
+        community_engine: Literal["networkx", "igraph"] = "networkx",
+        layout_engine: Literal["networkx", "graphtool"] = "networkx",
     ):
         """Build the co-mention network with edge weights
 
@@ -261,22 +272,27 @@ class PubTatorGraphBuilder:
                 Whether to apply the community detection method. Defaults to True.
             max_edges (int, optional):
                 For keep top [max_edges] edges sorted descendingly by edge weights. Defaults to 0.
+            community_engine (Literal["networkx", "igraph"], optional):
+                Louvain implementation used for community detection. "igraph" runs the
+                C implementation and falls back to NetworkX if igraph is not installed.
+                Defaults to "networkx".
+            layout_engine (Literal["networkx", "graphtool"], optional):
+                Force-directed layout implementation. "graphtool" runs graph-tool's
+                multilevel SFDP layout at every graph size and falls back to NetworkX
+                if graph-tool is not installed. Defaults to "networkx".
         """
 
         self._build_nodes(pmid_weights)
         self._build_edges(pmid_weights, weighting_method)
 
-        self._remove_edges_by_weight(self.graph, edge_weight_cutoff)
-        self._remove_edges_by_rank(self.graph, max_edges)
-
-        self._remove_isolated_nodes(self.graph)
+        self._prune_graph(self.graph, edge_weight_cutoff, max_edges)
 
         self._check_graph_properties(self.graph)
 
-        self._set_network_layout(self.graph)
+        self._set_network_layout(self.graph, engine=layout_engine)
 
         if community:
-            self._set_network_communities(self.graph)
+            self._set_network_communities(self.graph, engine=community_engine)
 
         self._log_graph_info()
         self._updated = False
@@ -320,9 +336,7 @@ class PubTatorGraphBuilder:
 
             data["num_articles"] = len(data["pmids"])
             if pmid_weights is not None:
-                data["weighted_num_articles"] = round(
-                    sum([pmid_weights.get(pmid, 1) for pmid in data["pmids"]]), 2
-                )
+                data["weighted_num_articles"] = _weighted_count(data["pmids"], pmid_weights)
             else:
                 data["weighted_num_articles"] = data["num_articles"]
 
@@ -335,23 +349,29 @@ class PubTatorGraphBuilder:
         self.normalize_graph_ids(self.graph)
 
         # Update attributes for edges
+        node_attrs = self.graph.nodes
+        edge_attrs = []
+        n_x = []
+        n_y = []
+        n_xy = []
         for u, v, data in self.graph.edges(data=True):
             data["num_relations"] = len(data["relations"])
             if pmid_weights is not None:
-                data["weighted_num_relations"] = round(
-                    sum([pmid_weights.get(pmid, 1) for pmid in data["relations"]]), 2
-                )
+                data["weighted_num_relations"] = _weighted_count(data["relations"], pmid_weights)
             else:
                 data["weighted_num_relations"] = data["num_relations"]
 
-            # data["num_relations_doc_weighted"] = num_evidence *
-            data["npmi"] = normalized_pointwise_mutual_information(
-                n_x=self.graph.nodes[u]["weighted_num_articles"],
-                n_y=self.graph.nodes[v]["weighted_num_articles"],
-                n_xy=data["weighted_num_relations"],
-                N=self.num_articles,
-                n_threshold=2,
-            )
+            edge_attrs.append(data)
+            n_x.append(node_attrs[u]["weighted_num_articles"])
+            n_y.append(node_attrs[v]["weighted_num_articles"])
+            n_xy.append(data["weighted_num_relations"])
+
+        # NPMI for all edges at once instead of one Python call per edge
+        npmis = normalized_pointwise_mutual_information_array(
+            n_x, n_y, n_xy, N=self.num_articles, n_threshold=2
+        )
+        for data, npmi in zip(edge_attrs, npmis, strict=True):
+            data["npmi"] = npmi
 
         # Calculate scaled weights
         self.recalculate_edge_weights(self.graph, weighting_method)
@@ -361,43 +381,73 @@ class PubTatorGraphBuilder:
         graph: nx.Graph, weighting_method: Literal["freq", "npmi"] = "freq"
     ):
         """Recalculate edge weights and widths based on selected method"""
+        attr = "npmi" if weighting_method == "npmi" else "weighted_num_relations"
+        # Keep the edge data dicts so the weights can be written back without
+        # looking each edge up again
+        edge_weights = [
+            (data, data[attr]) for _, _, data in graph.edges(data=True) if attr in data
+        ]
+
         # Calculate scaled weights
         if weighting_method == "npmi":
-            edge_weights = nx.get_edge_attributes(graph, "npmi")
             scale_factor = MAX_EDGE_WIDTH
         else:  # freq
-            edge_weights = nx.get_edge_attributes(graph, "weighted_num_relations")
-
             if not edge_weights:
                 return
 
-            max_weight = max(edge_weights.values())
+            max_weight = max(weight for _, weight in edge_weights)
             scale_factor = min(MAX_EDGE_WIDTH / max_weight, 1) if max_weight > 0 else 1
 
         # Update scaled weights for edges
-        for edge, weight in edge_weights.items():
+        for data, weight in edge_weights:
             scaled_weight = round(max(weight * scale_factor, 0.0), 2)
-            if graph.has_edge(*edge):
-                graph.edges[edge].update(
-                    {
-                        "edge_weight": scaled_weight,
-                        "edge_width": max(scaled_weight, MIN_EDGE_WIDTH),
-                    }
-                )
+            data["edge_weight"] = scaled_weight
+            data["edge_width"] = max(scaled_weight, MIN_EDGE_WIDTH)
+
+    @staticmethod
+    def _edge_width_range(
+        edge_weight_cutoff: int | float | list[int | float],
+    ) -> tuple[int | float, int | float]:
+        # Determine min/max cutoffs
+        if isinstance(edge_weight_cutoff, (list, tuple)):
+            return edge_weight_cutoff[0], edge_weight_cutoff[1]
+        return edge_weight_cutoff, float("inf")
+
+    @staticmethod
+    def _prune_graph(
+        graph: nx.Graph,
+        edge_weight_cutoff: int | float | list[int | float],
+        max_edges: int,
+    ):
+        """Apply `_remove_edges_by_weight`, `_remove_edges_by_rank` and
+        `_remove_isolated_nodes` with a single pass over the edges"""
+        min_cut, max_cut = PubTatorGraphBuilder._edge_width_range(edge_weight_cutoff)
+
+        to_remove = []
+        kept = []
+        for u, v, edge_attrs in graph.edges(data=True):
+            width = edge_attrs.get("edge_width", 1.0)
+            if width < min_cut or width > max_cut:
+                to_remove.append((u, v))
+            else:
+                kept.append((u, v, edge_attrs))
+
+        if 0 < max_edges < len(kept):
+            top_edges = {
+                (u, v)
+                for u, v, _ in heapq.nlargest(max_edges, kept, key=lambda x: x[2]["edge_weight"])
+            }
+            to_remove.extend((u, v) for u, v, _ in kept if (u, v) not in top_edges)
+
+        graph.remove_edges_from(to_remove)
+        graph.remove_nodes_from(list(nx.isolates(graph)))
 
     @staticmethod
     def _remove_edges_by_weight(
         graph: nx.Graph, edge_weight_cutoff: int | float | list[int | float]
     ):
         to_remove = []
-
-        # Determine min/max cutoffs
-        if isinstance(edge_weight_cutoff, (list, tuple)):
-            min_cut = edge_weight_cutoff[0]
-            max_cut = edge_weight_cutoff[1]
-        else:
-            min_cut = edge_weight_cutoff
-            max_cut = float("inf")
+        min_cut, max_cut = PubTatorGraphBuilder._edge_width_range(edge_weight_cutoff)
 
         for u, v, edge_attrs in graph.edges(data=True):
             width = edge_attrs.get("edge_width", 1.0)
@@ -412,14 +462,16 @@ class PubTatorGraphBuilder:
             return
 
         if graph.number_of_edges() > max_edges:
-            edges = sorted(
-                # u, v, data
-                graph.edges(data=True),
-                key=lambda x: x[2]["edge_weight"],
-                reverse=True,
+            # Partial sort: equivalent to sorted(..., reverse=True)[:max_edges],
+            # including the order of ties, without sorting every edge
+            kept = heapq.nlargest(
+                max_edges,
+                # u, v, edge_weight
+                graph.edges(data="edge_weight"),
+                key=itemgetter(2),
             )
-            for edge in edges[max_edges:]:
-                graph.remove_edge(edge[0], edge[1])
+            kept_edges = {(u, v) for u, v, _ in kept}
+            graph.remove_edges_from([(u, v) for u, v in graph.edges if (u, v) not in kept_edges])
 
     @staticmethod
     def _remove_isolated_nodes(graph: nx.Graph):
@@ -432,7 +484,19 @@ class PubTatorGraphBuilder:
             logger.warning(f"[Error] Find {num_selfloops} selfloops")
 
     @staticmethod
-    def _set_network_layout(graph: nx.Graph):
+    def _set_network_layout(
+        graph: nx.Graph,
+        engine: Literal["networkx", "graphtool"] = "networkx",
+        seed: int = 1,
+    ):
+        if engine == "graphtool":
+            if gt is not None:
+                # SFDP is multilevel, so it stays cheap past the circular-layout cutoff
+                pos = _graphtool_sfdp_layout(graph, seed)
+                nx.set_node_attributes(graph, pos, "pos")
+                return
+            logger.warning("graph-tool is not installed, using NetworkX for the layout")
+
         if graph.number_of_edges() > 1000:
             pos = nx.circular_layout(graph, scale=300)
         else:
@@ -440,12 +504,27 @@ class PubTatorGraphBuilder:
         nx.set_node_attributes(graph, pos, "pos")
 
     @staticmethod
-    def _set_network_communities(graph: nx.Graph, seed: int = 1):
+    def _louvain_communities(
+        graph: nx.Graph, seed: int, engine: Literal["networkx", "igraph"]
+    ) -> list[set]:
+        if engine == "igraph":
+            if ig is not None:
+                return _igraph_louvain_communities(graph, seed)
+            logger.warning("igraph is not installed, using NetworkX for community detection")
+
+        return nx.community.louvain_communities(graph, seed=seed, weight="edge_weight")  # type: ignore
+
+    @staticmethod
+    def _set_network_communities(
+        graph: nx.Graph,
+        seed: int = 1,
+        engine: Literal["networkx", "igraph"] = "networkx",
+    ):
         # Prevent ZeroDivisionError if graph has no edges
         if graph.number_of_edges() == 0:
             return
 
-        communities = nx.community.louvain_communities(graph, seed=seed, weight="edge_weight")  # type: ignore
+        communities = PubTatorGraphBuilder._louvain_communities(graph, seed, engine)
         community_labels = set()
         for c_idx, community in enumerate(communities):
             # Find highest degree node in community
@@ -470,7 +549,8 @@ class PubTatorGraphBuilder:
                 "type": source_attrs.get("type", "Unknown"),
                 "mesh": source_attrs.get("mesh", ""),
                 "name": source_attrs.get("name", f"Community {c_idx}"),
-                "pmids": source_attrs.get("pmids", set()),  # Use source pmids or empty set
+                # Copy so the community node does not share its set with the source node
+                "pmids": set(source_attrs.get("pmids", ())),
                 "num_articles": source_attrs.get("num_articles", 0),
                 "weighted_num_articles": source_attrs.get("weighted_num_articles", 0),
                 "marked": False,
@@ -479,44 +559,47 @@ class PubTatorGraphBuilder:
             }
 
             node_data = GraphNode(**community_attrs)
-            graph.add_node(community_node, **asdict(node_data))
+            graph.add_node(community_node, **vars(node_data))
 
             for node in community:
                 graph.nodes[node]["parent"] = community_node
 
         graph.graph["num_communities"] = len(community_labels)
 
-        # Gather edges between communities
-        inter_edge_weight = defaultdict(float)
-        inter_edge_pmids = defaultdict(dict)
+        # Gather edges between communities in one pass, accumulating the
+        # summed weight and the PMID set of each community pair together
+        inter_edges: defaultdict[tuple[str, str], list] = defaultdict(lambda: [0.0, set()])
+        parent = nx.get_node_attributes(graph, "parent")
         to_remove = []
         for u, v, attrs in graph.edges(data=True):
-            if (c_0 := graph.nodes[u]["parent"]) != (c_1 := graph.nodes[v]["parent"]):
+            if (c_0 := parent.get(u)) != (c_1 := parent.get(v)):
                 if c_0 is None or c_1 is None:
                     logger.warning(f"[Error] Node {u} or {v} is not in any community")
                     continue
                 to_remove.append((u, v))
-                community_edge = tuple(sorted([c_0, c_1]))
-                inter_edge_weight[community_edge] += attrs["edge_weight"]
-                inter_edge_pmids[community_edge].update(attrs["relations"])
+                community_edge = (c_0, c_1) if c_0 <= c_1 else (c_1, c_0)
+                acc = inter_edges[community_edge]
+                acc[0] += attrs["edge_weight"]
+                acc[1].update(attrs["relations"])
 
         graph.remove_edges_from(to_remove)
-        for (c_0, c_1), weight in inter_edge_weight.items():
+        community_edges = []
+        for (c_0, c_1), (weight, pmids) in inter_edges.items():
             # Log-adjusted weight for balance
             try:
                 weight = math.log(weight) * 5
                 weight = 0.0 if weight < 0.0 else weight
             except ValueError:
                 weight = 0.0
-            pmids = set(inter_edge_pmids[(c_0, c_1)])
             edge_data = CommunityEdge(
                 _id=generate_stable_id(f"comm_{c_0}_{c_1}"),
                 type="community",
                 edge_weight=weight,
                 edge_width=max(weight, MIN_EDGE_WIDTH),
-                pmids=set(pmids),
+                pmids=pmids,
             )
-            graph.add_edge(c_0, c_1, **asdict(edge_data))
+            community_edges.append((c_0, c_1, vars(edge_data)))
+        graph.add_edges_from(community_edges)
 
     def _log_graph_info(self):
         logger.info(f"# articles: {len(self.graph.graph['pmid_title'])}")
@@ -525,27 +608,24 @@ class PubTatorGraphBuilder:
         logger.info(f"# nodes: {self.graph.number_of_nodes() - num_communities}")
         logger.info(f"# edges: {self.graph.number_of_edges()}")
 
-    def _create_complete_graph_edges(
-        self, node_ids: Sequence[str], pmid: str
-    ) -> list[PubTatorEdge]:
+    @staticmethod
+    def _create_complete_graph_edges(node_ids: Sequence[str], pmid: str) -> list[PubTatorEdge]:
         """Build co-mention edges for all given nodes
 
         Assuming that all nodes are in the same article.
         """
-        edges: list[PubTatorEdge] = []
-        for i in range(len(node_ids) - 1):
-            for j in range(i + 1, len(node_ids)):
-                # Node1 and Node2 always follow alphabetical order
-                if node_ids[i] <= node_ids[j]:
-                    edge = PubTatorEdge(node_ids[i], node_ids[j], pmid, "co-mention")
-                else:
-                    edge = PubTatorEdge(node_ids[j], node_ids[i], pmid, "co-mention")
-                edges.append(edge)
+        if len(node_ids) < 2:
+            return []
 
-        return edges
+        # Sorting once means every pair from combinations() is already in
+        # alphabetical order (node1 <= node2)
+        return [
+            PubTatorEdge(node1_id, node2_id, pmid, "co-mention")
+            for node1_id, node2_id in combinations(sorted(node_ids), 2)
+        ]
 
+    @staticmethod
     def _create_relation_edges(
-        self,
         mesh_node_ids: Sequence[str],
         relations: Sequence[PubTatorRelation],
     ) -> list[PubTatorEdge]:
@@ -558,7 +638,9 @@ class PubTatorGraphBuilder:
                 continue
             else:
                 edges.append(
-                    PubTatorEdge(node_ids[0], node_ids[1], relation.pmid, relation.relation_type)
+                    PubTatorEdge(
+                        node_ids[0], node_ids[1], sys.intern(relation.pmid), relation.relation_type
+                    )
                 )
 
         return edges
@@ -595,6 +677,10 @@ class PubTatorGraphBuilder:
             return []
 
     def _add_nodes(self, nodes: Mapping[str, PubTatorNode]):
+        # Existing nodes are updated in place; new ones are added in a single
+        # add_nodes_from() call at the end
+        node_attrs = self.graph._node
+        new_nodes = []
         for node_id, data in nodes.items():
             # Source validation: ensure node has valid PMID
             if not hasattr(data, "pmid") or not data.pmid or str(data.pmid).strip() == "":
@@ -610,8 +696,11 @@ class PubTatorGraphBuilder:
                 logger.warning(f"Skipping invalid node {node_id}: missing type")
                 continue
 
-            if self.graph.has_node(node_id):
-                self.graph.nodes[node_id]["pmids"].add(data.pmid)
+            # Every annotation line carries its own copy of the PMID string;
+            # interning keeps one shared object per article in the pmid sets
+            pmid = sys.intern(data.pmid)
+            if (existing := node_attrs.get(node_id)) is not None:
+                existing["pmids"].add(pmid)
             else:
                 node_data = GraphNode(
                     _id=generate_stable_id(f"node_{node_id}"),
@@ -621,41 +710,48 @@ class PubTatorGraphBuilder:
                     type=data.type,
                     mesh=data.mesh,
                     name=data.name,
-                    pmids={data.pmid},
+                    pmids={pmid},
                     num_articles=None,
                     weighted_num_articles=None,
                     marked=False,
                     parent=None,
                     pos=None,
                 )
-                self.graph.add_node(node_id, **asdict(node_data))
+                # vars() hands over the freshly built field dict; asdict() would
+                # deep-copy every value again
+                new_nodes.append((node_id, vars(node_data)))
+
+        self.graph.add_nodes_from(new_nodes)
 
     def _add_edges(self, edges: Sequence[PubTatorEdge]):
+        # Probe the adjacency dict directly: one lookup per edge instead of
+        # has_edge() followed by an EdgeView lookup
+        adj = self.graph._adj
+        # New edges are added in a single add_edges_from() call at the end, so
+        # pairs repeated within this batch are merged into the pending entry
+        new_edges: dict[tuple[str, str], dict] = {}
         for edge in edges:
-            if self.graph.has_edge(edge.node1_id, edge.node2_id):
+            edge_data = adj.get(edge.node1_id, {}).get(edge.node2_id)
+            if edge_data is None:
+                edge_data = new_edges.get((edge.node1_id, edge.node2_id))
+            if edge_data is None:
+                edge_data = new_edges.get((edge.node2_id, edge.node1_id))
+            if edge_data is not None:
                 # Edge exists - update relations and metadata
-                edge_data = self.graph.edges[edge.node1_id, edge.node2_id]
-                relation_dict: dict[str, set[str]] = edge_data["relations"]
-
-                if relation_dict.get(edge.pmid) is None:
-                    relation_dict[edge.pmid] = {edge.relation}
-                else:
-                    relation_dict[edge.pmid].add(edge.relation)
+                edge_data["relations"].setdefault(edge.pmid, set()).add(edge.relation)
 
                 # Update semantic metadata if present
                 if edge.confidence is not None:
-                    if edge_data.get("confidences") is None:
-                        edge_data["confidences"] = {}
-                    if edge.pmid not in edge_data["confidences"]:
-                        edge_data["confidences"][edge.pmid] = {}
-                    edge_data["confidences"][edge.pmid][edge.relation] = edge.confidence
+                    confidences = edge_data.get("confidences")
+                    if confidences is None:
+                        confidences = edge_data["confidences"] = {}
+                    confidences.setdefault(edge.pmid, {})[edge.relation] = edge.confidence
 
                 if edge.evidence is not None:
-                    if edge_data.get("evidences") is None:
-                        edge_data["evidences"] = {}
-                    if edge.pmid not in edge_data["evidences"]:
-                        edge_data["evidences"][edge.pmid] = {}
-                    edge_data["evidences"][edge.pmid][edge.relation] = edge.evidence
+                    evidences = edge_data.get("evidences")
+                    if evidences is None:
+                        evidences = edge_data["evidences"] = {}
+                    evidences.setdefault(edge.pmid, {})[edge.relation] = edge.evidence
             else:
                 # Create new edge with metadata
                 confidences = None
@@ -679,19 +775,121 @@ class PubTatorGraphBuilder:
                     confidences=confidences,
                     evidences=evidences,
                 )
-                self.graph.add_edge(edge.node1_id, edge.node2_id, **asdict(edge_data))
+                new_edges[edge.node1_id, edge.node2_id] = vars(edge_data)
+
+        self.graph.add_edges_from((u, v, data) for (u, v), data in new_edges.items())
 
     def _add_attributes(self, article: PubTatorArticle):
         # Add pmid_title and pmid_abstract as graph attributes
-        self.graph.graph["pmid_title"][article.pmid] = article.title
+        pmid = sys.intern(article.pmid)
+        self.graph.graph["pmid_title"][pmid] = article.title
         if article.abstract:
-            self.graph.graph["pmid_abstract"][article.pmid] = article.abstract
+            self.graph.graph["pmid_abstract"][pmid] = article.abstract
 
     def _init_graph_attributes(self):
         self.graph.graph["pmid_title"] = {}
         self.graph.graph["pmid_abstract"] = {}  # NEW: Store abstracts for RAG
 
 
+def _collect_article_graph(
+    article: PubTatorArticle,
+    mesh_only: bool,
+    use_mesh_vocabulary: bool,
+    edge_builder: Callable[[PubTatorArticle, PubTatorNodeCollection], list[PubTatorEdge]] | None,
+) -> tuple[dict[str, PubTatorNode], list[PubTatorEdge]]:
+    """Collect the nodes and co-mention/relation edges of a single article"""
+    # Articles without annotations are common in PubTator dumps
+    if not article.annotations:
+        return {}, []
+
+    node_collection = PubTatorNodeCollection(
+        mesh_only=mesh_only, use_mesh_vocabulary=use_mesh_vocabulary
+    )
+    for annotation in article.annotations:
+        node_collection.add_node(annotation)
+
+    edges = edge_builder(article, node_collection) if edge_builder is not None else []
+
+    return node_collection.nodes, edges
+
+
+def _co_mention_edges(
+    article: PubTatorArticle, node_collection: PubTatorNodeCollection
+) -> list[PubTatorEdge]:
+    # Co-occurrence method: create edges for all co-occurring entities
+    return PubTatorGraphBuilder._create_complete_graph_edges(
+        list(node_collection.nodes.keys()), sys.intern(article.pmid)
+    )
+
+
+def _biorex_relation_edges(
+    article: PubTatorArticle, node_collection: PubTatorNodeCollection
+) -> list[PubTatorEdge]:
+    # Relation-only method: only use BioREx annotated relations
+    return PubTatorGraphBuilder._create_relation_edges(
+        list(node_collection.mesh_nodes.keys()), article.relations
+    )
+
+
+# Per-article edge builder for each non-semantic edge_method
+_ARTICLE_EDGE_BUILDERS = {
+    "co-occurrence": _co_mention_edges,
+    "relation": _biorex_relation_edges,
+}
+
+
+def _weighted_count(pmids: Collection[str], pmid_weights: Mapping[str, int | float]) -> float:
+    """Sum article weights over `pmids` (unweighted articles count as 1)"""
+    # map() keeps the per-PMID lookup in C and avoids building a temporary list
+    return round(sum(map(pmid_weights.get, pmids, repeat(1, len(pmids)))), 2)
+
+
+def _graphtool_sfdp_layout(graph: nx.Graph, seed: int) -> dict:
+    """Run graph-tool's SFDP layout and rescale it to the NetworkX layout range"""
+    nodes = list(graph)
+    if not nodes:
+        return {}
+    node_index = {node: i for i, node in enumerate(nodes)}
+    edges = []
+    weights = []
+    for u, v, weight in graph.edges(data="edge_weight", default=1.0):
+        edges.append((node_index[u], node_index[v]))
+        weights.append(weight)
+
+    g = gt.Graph(directed=False)
+    g.add_vertex(len(nodes))
+    g.add_edge_list(edges)
+    eweight = g.new_edge_property("double", vals=weights)
+
+    gt.seed_rng(seed)
+    coords = gt.sfdp_layout(g, eweight=eweight).get_2d_array([0, 1]).T
+    return nx.rescale_layout_dict(dict(zip(nodes, coords, strict=True)), scale=300)
+
+
+def _igraph_louvain_communities(graph: nx.Graph, seed: int) -> list[set]:
+    """Run igraph's multilevel (Louvain) method and map membership back to node IDs"""
+    nodes = list(graph)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    edges = []
+    weights = []
+    for u, v, weight in graph.edges(data="edge_weight", default=1.0):
+        edges.append((node_index[u], node_index[v]))
+        weights.append(weight)
+
+    g = ig.Graph(n=len(nodes), edges=edges)
+    # igraph draws from a module-level RNG, so swap in a seeded one for reproducibility
+    ig.set_random_number_generator(random.Random(seed))
+    try:
+        membership = g.community_multilevel(weights=weights).membership
+    finally:
+        ig.set_random_number_generator(random)
+
+    communities: dict[int, set] = {}
+    for node, label in zip(nodes, membership, strict=True):
+        communities.setdefault(label, set()).add(node)
+    return list(communities.values())
+
+
 def save_graph(
     G: nx.Graph,
     savepath: str | Path,
@@ -703,8 +901,17 @@ def save_graph(
         "json": "netmedex.cytoscape_js.save_as_json",
     }
     if output_filetype == "pickle":
+        # Compression is opt-in via a .zst suffix so .pkl files stay plain pickles
+        compress = Path(savepath).suffix == ".zst"
+        if compress and zstd is None:
+            raise ImportError(f"Saving {savepath} requires 'zstandard'; install netmedex[zstd]")
         with open(savepath, "wb") as f:
-            pickle.dump(G, f)
+            if compress:
+                # Stream through zstd so the uncompressed pickle is never held in memory
+                with zstd.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(f, closefd=False) as z:
+                    pickle.dump(G, z, protocol=pickle.HIGHEST_PROTOCOL)
+            else:
+                pickle.dump(G, f, protocol=pickle.HIGHEST_PROTOCOL)
     else:
         module_path, func_name = format_function_map[output_filetype].rsplit(".", 1)
         module = importlib.import_module(module_path)
@@ -714,8 +921,28 @@ def save_graph(
     logger.info(f"Save graph to {savepath}")
 
 
-def load_graph(graph_pickle_path: str):
-    with open(graph_pickle_path, "rb") as f:
-        G = pickle.load(f)
+def load_graph(graph_pickle_path: str | Path):
+    # Unpickling a NetworkX graph allocates many small dicts, each of which can
+    # trigger a pointless GC pass, so suspend the collector during the load
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(graph_pickle_path, "rb") as f:
+            # Detect zstd-compressed pickles by their magic number so plain
+            # pickles saved by older versions still load
+            is_compressed = f.read(len(ZSTD_MAGIC)) == ZSTD_MAGIC
+            f.seek(0)
+            if is_compressed:
+                if zstd is None:
+                    raise ImportError(
+                        f"{graph_pickle_path} is zstd-compressed; install 'zstandard' to load it"
+                    )
+                with zstd.ZstdDecompressor().stream_reader(f, closefd=False) as z:
+                    G = pickle.load(io.BufferedReader(z))
+            else:
+                G = pickle.load(f)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
 
     return G
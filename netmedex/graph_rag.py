@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+# PEP 810 (Python 3.15+): networkx is only referenced in annotations.
+# Ignored on older interpreters.
+__lazy_modules__ = ["networkx"]
+
+import heapq
 import logging
+from collections import OrderedDict
+from itertools import combinations, count
+from operator import itemgetter
+
 import networkx as nx
 
+try:
+    import ahocorasick
+except ImportError:
+    # pyahocorasick is optional; node matching falls back to substring scans
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Number of get_subgraph_context results kept per retriever
+_SUBGRAPH_CACHE_SIZE = 256
+
 
 class GraphRetriever:
     """
@@ -21,18 +39,49 @@ class GraphRetriever:
         """
         self.graph = graph
         self.node_rag = node_rag
+        # The graph is fixed for the lifetime of a retriever, so subgraph
+        # descriptions can be memoized by (node set, max_hops)
+        self._subgraph_cache: OrderedDict[tuple[frozenset, int], str] = OrderedDict()
+        self._build_node_index()
+
+    def invalidate(self):
+        """Rebuild the node indexes and drop cached context after the graph changes."""
+        self._subgraph_cache.clear()
         self._build_node_index()
 
     def _build_node_index(self):
         """Build a case-insensitive index of node names to IDs."""
         self.name_to_id = {}
+        # (name, type) per node for formatting; type is None when missing
+        self._node_display: dict[str, tuple[str, str | None]] = {}
         for node_id, data in self.graph.nodes(data=True):
             # Index the primary ID
-            self.name_to_id[str(node_id).lower()] = node_id
+            id_key = str(node_id).lower()
+            self.name_to_id[id_key] = node_id
 
             # Index the 'name' attribute if it exists
-            if "name" in data and data["name"]:
-                self.name_to_id[str(data["name"]).lower()] = node_id
+            name = data.get("name")
+            if name:
+                name_key = str(name).lower()
+                if name_key != id_key:
+                    self.name_to_id[name_key] = node_id
+
+            self._node_display[node_id] = (data.get("name", node_id), data.get("type"))
+
+        # Aho-Corasick automaton over all names: one pass over the query finds
+        # every indexed name it contains
+        self._name_automaton = None
+        # Fallback without pyahocorasick: names paired with their leading
+        # trigram, so most names are rejected before the substring scan
+        self._name_prefixes = []
+        if ahocorasick is not None and self.name_to_id:
+            automaton = ahocorasick.Automaton()
+            for name, node_id in self.name_to_id.items():
+                automaton.add_word(name, node_id)
+            automaton.make_automaton()
+            self._name_automaton = automaton
+        else:
+            self._name_prefixes = [(name, name[:3]) for name in self.name_to_id]
 
     def find_relevant_nodes(self, query: str) -> list[str]:
         """
@@ -52,10 +101,14 @@ class GraphRetriever:
         matched_nodes = set()
 
         # 1. Exact/Substring Matching
-        sorted_names = sorted(self.name_to_id.keys(), key=len, reverse=True)
-        for name in sorted_names:
-            if name in query_lower:
-                matched_nodes.add(self.name_to_id[name])
+        if self._name_automaton is not None:
+            matched_nodes.update(node_id for _, node_id in self._name_automaton.iter(query_lower))
+        else:
+            query_trigrams = {query_lower[i : i + 3] for i in range(len(query_lower) - 2)}
+            for name, prefix in self._name_prefixes:
+                # Names shorter than 3 characters have no trigram to check
+                if (len(prefix) < 3 or prefix in query_trigrams) and name in query_lower:
+                    matched_nodes.add(self.name_to_id[name])
 
         # 2. Semantic Vector Matching (if available)
         if self.node_rag:
@@ -70,7 +123,7 @@ class GraphRetriever:
 
         return list(matched_nodes)
 
-    def get_subgraph_context(self, relevant_nodes: list[str], max_hops: int = 2) -> str:
+    def get_subgraph_context(self, relevant_nodes: list[str], max_hops: int | None = None) -> str:
         """
         Extract textual context describing the subgraph relevant to the nodes.
 
@@ -80,7 +133,8 @@ class GraphRetriever:
 
         Args:
             relevant_nodes: List of starting node IDs.
-            max_hops: Maximum number of hops for pathfinding.
+            max_hops: Maximum number of hops for pathfinding. None (default)
+                reports the shortest path however long it is.
 
         Returns:
             Formatted string describing the structural relationships.
@@ -88,6 +142,18 @@ class GraphRetriever:
         if not relevant_nodes:
             return "No specific entities from the graph were found in the query."
 
+        key = (frozenset(relevant_nodes), max_hops)
+        if key in self._subgraph_cache:
+            self._subgraph_cache.move_to_end(key)
+            return self._subgraph_cache[key]
+
+        context = self._build_subgraph_context(relevant_nodes, max_hops)
+        self._subgraph_cache[key] = context
+        if len(self._subgraph_cache) > _SUBGRAPH_CACHE_SIZE:
+            self._subgraph_cache.popitem(last=False)
+        return context
+
+    def _build_subgraph_context(self, relevant_nodes: list[str], max_hops: int | None) -> str:
         # Filter nodes to ensure they exist in the current graph
         # (graph might have changed or passed subgraphs might be disjoint)
         valid_nodes = [n for n in relevant_nodes if self.graph.has_node(n)]
@@ -100,33 +166,31 @@ class GraphRetriever:
         # Case 1: Single Node Analysis - Show immediate context
         if len(valid_nodes) == 1:
             start_node = valid_nodes[0]
-            start_data = self.graph.nodes[start_node]
-            start_name = start_data.get("name", start_node)
-            start_type = start_data.get("type", "Entity")
+            start_name, start_type = self._node_display[start_node]
+            if start_type is None:
+                start_type = "Entity"
 
             context_lines.append(f"Entity: {start_name} ({start_type})")
 
-            neighbors = list(self.graph.neighbors(start_node))
-            if not neighbors:
+            # Walk the adjacency dict once; it maps each neighbor to its edge data
+            adjacency = self.graph[start_node]
+            if not adjacency:
                 context_lines.append(f"- {start_name} has no connections in this view.")
             else:
-                context_lines.append(f"- Direct connections ({len(neighbors)}):")
-                # Sort neighbors by edge weight if available
-                scored_neighbors = []
-                for n in neighbors:
-                    edge = self.graph[start_node][n]
-                    weight = edge.get("edge_weight", 0)
-                    scored_neighbors.append((n, weight))
-
-                scored_neighbors.sort(key=lambda x: x[1], reverse=True)
-
-                for n, weight in scored_neighbors[:10]:  # Limit to top 10
-                    n_data = self.graph.nodes[n]
-                    n_name = n_data.get("name", n)
-                    n_type = n_data.get("type", "m")
+                context_lines.append(f"- Direct connections ({len(adjacency)}):")
+                # Keep the top 10 neighbors by edge weight if available
+                top_neighbors = heapq.nlargest(
+                    10,
+                    ((n, edge.get("edge_weight", 0), edge) for n, edge in adjacency.items()),
+                    key=itemgetter(1),
+                )
+
+                for n, weight, edge_data in top_neighbors:
+                    n_name, n_type = self._node_display[n]
+                    if n_type is None:
+                        n_type = "m"
 
                     # Inspect edge relations
-                    edge_data = self.graph[start_node][n]
                     relations = self._summarize_relations(edge_data)
 
                     context_lines.append(
@@ -135,45 +199,91 @@ class GraphRetriever:
 
         # Case 2: Multi-Node Analysis - Find paths
         else:
+            display = self._node_display
             context_lines.append(
-                f"Relational analysis between: {', '.join([self.graph.nodes[n].get('name', n) for n in valid_nodes])}"
+                f"Relational analysis between: {', '.join([display[n][0] for n in valid_nodes])}"
             )
 
             pairs_analyzed = 0
-            # Compare all pairs (limit to a reasonable number to avoid combinatorial explosion)
-            import itertools
-
-            for n1, n2 in itertools.combinations(valid_nodes, 2):
-                if pairs_analyzed > 5:
-                    break
-
+            # Compare all pairs (limit to a reasonable number to avoid combinatorial explosion).
+            # Only pairs with a path count towards the limit, so the pairs can't
+            # simply be sliced; stop as soon as the sixth path is found instead.
+            for n1, n2 in combinations(valid_nodes, 2):
                 path = self._find_connection(n1, n2, max_hops)
                 if path:
                     context_lines.append(f"\nPath: {self._format_path(path)}")
                     pairs_analyzed += 1
+                    if pairs_analyzed > 5:
+                        break
                 else:
+                    within = f" within {max_hops} hops" if max_hops is not None else ""
                     context_lines.append(
-                        f"\nNo direct connection found between {self.graph.nodes[n1].get('name', n1)} and {self.graph.nodes[n2].get('name', n2)} within {max_hops} hops."
+                        f"\nNo direct connection found between {display[n1][0]} and {display[n2][0]}{within}."
                     )
 
         return "\n".join(context_lines)
 
-    def _find_connection(self, source: str, target: str, cutoff: int) -> list[str] | None:
-        """Find meaningful connection between two nodes."""
-        try:
-            return nx.shortest_path(self.graph, source, target)
-        except nx.NetworkXNoPath:
-            return None
-        except Exception:
-            return None
+    def _find_connection(
+        self, source: str, target: str, cutoff: int | None = None
+    ) -> list[str] | None:
+        """Find the shortest path between two nodes, of at most `cutoff` hops if given."""
+        if source == target:
+            return [source]
+
+        # Bidirectional BFS: grow the smaller frontier by one hop at a time, so
+        # after `cutoff` expansions every path within the limit has been seen
+        adjacency = self.graph.adj
+        pred = {source: None}
+        succ = {target: None}
+        forward, backward = [source], [target]
+        for _ in range(cutoff) if cutoff is not None else count():
+            if len(forward) <= len(backward):
+                visited, other, frontier = pred, succ, forward
+            else:
+                visited, other, frontier = succ, pred, backward
+
+            next_frontier = []
+            for u in frontier:
+                for v in adjacency[u]:
+                    if v in visited:
+                        continue
+                    visited[v] = u
+                    if v in other:
+                        return self._join_path(pred, succ, v)
+                    next_frontier.append(v)
+
+            if not next_frontier:
+                return None
+            if frontier is forward:
+                forward = next_frontier
+            else:
+                backward = next_frontier
+
+        return None
+
+    @staticmethod
+    def _join_path(pred: dict, succ: dict, meeting_node) -> list[str]:
+        """Join the two half-paths of a bidirectional search at `meeting_node`."""
+        path = []
+        node = meeting_node
+        while node is not None:
+            path.append(node)
+            node = pred[node]
+        path.reverse()
+        node = succ[meeting_node]
+        while node is not None:
+            path.append(node)
+            node = succ[node]
+        return path
 
     def _format_path(self, path: list[str]) -> str:
         """Format a node sequence path into a readable string."""
+        display = self._node_display
         descriptions = []
         for i in range(len(path) - 1):
             u, v = path[i], path[i + 1]
-            u_name = self.graph.nodes[u].get("name", u)
-            v_name = self.graph.nodes[v].get("name", v)
+            u_name = display[u][0]
+            v_name = display[v][0]
             edge_data = self.graph[u][v]
             relations = self._summarize_relations(edge_data)
             descriptions.append(f"{u_name} --[{relations}]--> {v_name}")
@@ -183,13 +293,14 @@ class GraphRetriever:
     def _summarize_relations(self, edge_data: dict) -> str:
         """Summarize relation types in an edge with supporting PMIDs."""
         # relations is typically {pmid: {set of types}}
-        all_types = set()
-        pmids = set()
+        relations = edge_data.get("relations") or {}
 
-        if "relations" in edge_data:
-            for pmid, pmid_relations in edge_data["relations"].items():
-                all_types.update(pmid_relations)
-                pmids.add(pmid)
+        # Only 3 types are shown, so stop collecting once there are enough
+        all_types = set()
+        for pmid_relations in relations.values():
+            all_types.update(pmid_relations)
+            if len(all_types) >= 3:
+                break
 
         if not all_types:
             type_str = "associated"
@@ -197,10 +308,11 @@ class GraphRetriever:
             type_str = ", ".join(list(all_types)[:3])
 
         # Add PMIDs
-        if pmids:
-            # Sort for deterministic output and limit to top 3
-            sorted_pmids = sorted(pmids)[:3]
-            pmid_str = ", ".join([f"PMID:{p}" for p in sorted_pmids])
+        if relations:
+            # PMIDs are the (unique) keys; pick the 3 smallest for deterministic
+            # output without sorting all of them
+            top_pmids = heapq.nsmallest(3, relations)
+            pmid_str = ", ".join([f"PMID:{p}" for p in top_pmids])
             return f"{type_str} [{pmid_str}]"
 
         return type_str
@@ -11,6 +11,8 @@ import logging
 from dataclasses import dataclass
 from typing import Any
 
+from netmedex.rag import SharedEmbedder, _max_batch_size, _query_input
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,16 +29,23 @@ class GraphNode:
 class NodeRAG:
     """RAG system for indexing and retrieving Graph Nodes"""
 
-    def __init__(self, llm_client, collection_name: str = "graph_nodes"):
+    def __init__(
+        self,
+        llm_client,
+        collection_name: str = "graph_nodes",
+        embedder: SharedEmbedder | None = None,
+    ):
         """
         Initialize the Node RAG system.
 
         Args:
             llm_client: LLM client with embeddings capability
             collection_name: Name for the vector database collection
+            embedder: Optional SharedEmbedder used to embed search queries
         """
         self.llm_client = llm_client
         self.collection_name = collection_name
+        self.embedder = embedder
         self.collection = None
         self._initialized = False
 
@@ -115,8 +124,17 @@ class NodeRAG:
             if progress_callback:
                 progress_callback(f"Indexing {len(nodes)} graph nodes...")
 
+            # Chroma rejects add() calls above its max batch size, so large
+            # graphs are added in slices
+            batch_size = _max_batch_size(self.client) or len(ids)
             try:
-                self.collection.add(documents=documents_text, metadatas=metadatas, ids=ids)
+                for start in range(0, len(ids), batch_size):
+                    end = start + batch_size
+                    self.collection.add(
+                        documents=documents_text[start:end],
+                        metadatas=metadatas[start:end],
+                        ids=ids[start:end],
+                    )
             except Exception as e:
                 raise e
 
@@ -148,7 +166,12 @@ class NodeRAG:
             return []
 
         try:
-            results = self.collection.query(query_texts=[query], n_results=top_k)
+            # The node text itself is never used, so skip fetching documents
+            results = self.collection.query(
+                **_query_input(self.embedder, query),
+                n_results=top_k,
+                include=["metadatas", "distances"],
+            )
 
             hits = []
             if results["ids"] and results["distances"]:
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Sequence
+
+import numpy as np
 
 MIN_EDGE_WIDTH = 0
 MAX_EDGE_WIDTH = 20
@@ -40,3 +43,36 @@ def normalized_pointwise_mutual_information(
         npmi = min(npmi, below_threshold_default)
 
     return npmi
+
+
+def normalized_pointwise_mutual_information_array(
+    n_x: Sequence[float],
+    n_y: Sequence[float],
+    n_xy: Sequence[float],
+    N: int,
+    n_threshold: int,
+    below_threshold_default: float = MIN_EDGE_WIDTH / MAX_EDGE_WIDTH,
+) -> list[float]:
+    """Vectorized `normalized_pointwise_mutual_information` over many node pairs"""
+    n_x = np.asarray(n_x, dtype=np.float64)
+    n_y = np.asarray(n_y, dtype=np.float64)
+    n_xy = np.asarray(n_xy, dtype=np.float64)
+    if N <= 0:
+        return [below_threshold_default] * len(n_xy)
+
+    p_x = n_x / N
+    p_y = n_y / N
+    p_xy = n_xy / N
+    invalid = (n_x <= 0) | (n_y <= 0) | (n_xy <= 0)
+    always = p_xy == 1
+
+    # Masked-out entries may hit log2(0) or 0/0; they are replaced below
+    with np.errstate(divide="ignore", invalid="ignore"):
+        npmi = -1 + (np.log2(p_x) + np.log2(p_y)) / np.log2(p_xy)
+    npmi[always] = 1
+
+    below = (n_x < n_threshold) | (n_y < n_threshold)
+    npmi[below] = np.minimum(npmi[below], below_threshold_default)
+    npmi[invalid] = below_threshold_default
+
+    return npmi.tolist()
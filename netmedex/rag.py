@@ -7,15 +7,35 @@ This module provides a RAG system that indexes PubMed abstracts into a vector da
 and enables semantic search for relevant context during chat conversations.
 """
 
+import hashlib
 import logging
 from dataclasses import dataclass
-from typing import Any
+from functools import lru_cache
+from typing import Any, Literal
 
 logger = logging.getLogger(__name__)
 
 # Maximum tokens allowed per embedding request (OpenAI limit is 300k; use 250k as buffer)
 _MAX_TOKENS_PER_BATCH = 250_000
 
+# HNSW index presets stored as collection metadata. Chroma's defaults
+# (M=16, construction_ef=100, search_ef=100) apply when no profile is given.
+RETRIEVAL_PROFILES: dict[str, dict[str, int]] = {
+    "fast": {"hnsw:M": 16, "hnsw:construction_ef": 100, "hnsw:search_ef": 32},
+    "balanced": {"hnsw:M": 16, "hnsw:construction_ef": 100, "hnsw:search_ef": 64},
+    "recall-max": {"hnsw:M": 32, "hnsw:construction_ef": 200, "hnsw:search_ef": 128},
+}
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the cl100k_base encoding once, or return None if tiktoken is missing"""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
 
 def _count_tokens(text: str) -> int:
     """Return an approximate token count for *text* using tiktoken when available.
@@ -23,14 +43,28 @@ def _count_tokens(text: str) -> int:
     Falls back to a simple word-count heuristic (÷0.75) if tiktoken is not
     installed so the function never raises an ImportError at runtime.
     """
-    try:
-        import tiktoken
-
-        enc = tiktoken.get_encoding("cl100k_base")
-        return len(enc.encode(text))
-    except ImportError:
+    enc = _get_encoding()
+    if enc is None:
         # Rough heuristic: ~0.75 words per token on average
         return int(len(text.split()) / 0.75) + 1
+    return len(enc.encode(text))
+
+
+def _count_tokens_batch(texts: list[str]) -> list[int]:
+    """Token counts for many texts; tiktoken encodes the batch on multiple threads."""
+    enc = _get_encoding()
+    if enc is None:
+        return [_count_tokens(text) for text in texts]
+    return [len(tokens) for tokens in enc.encode_batch(texts)]
+
+
+def _max_batch_size(client) -> int | None:
+    """Largest number of records the Chroma client accepts in one add() call."""
+    get_max_batch_size = getattr(client, "get_max_batch_size", None)
+    if get_max_batch_size is None:
+        return None
+    size = get_max_batch_size()
+    return size if isinstance(size, int) and size > 0 else None
 
 
 def _build_token_batches(
@@ -38,8 +72,10 @@ def _build_token_batches(
     metadatas: list[dict],
     ids: list[str],
     max_tokens: int = _MAX_TOKENS_PER_BATCH,
+    max_docs: int | None = None,
 ) -> list[tuple[list[str], list[dict], list[str]]]:
-    """Split documents into batches that each stay under *max_tokens* tokens.
+    """Split documents into batches that each stay under *max_tokens* tokens
+    and, if given, *max_docs* documents.
 
     Returns a list of (texts, metadatas, ids) tuples ready to be passed to
     ``collection.add()``.
@@ -50,9 +86,14 @@ def _build_token_batches(
     cur_ids: list[str] = []
     cur_tokens = 0
 
-    for text, meta, doc_id in zip(documents_text, metadatas, ids):
-        tokens = _count_tokens(text)
-        if cur_tokens + tokens > max_tokens and cur_texts:
+    token_counts = _count_tokens_batch(documents_text)
+    for text, meta, doc_id, tokens in zip(
+        documents_text, metadatas, ids, token_counts, strict=True
+    ):
+        if cur_texts and (
+            cur_tokens + tokens > max_tokens
+            or (max_docs is not None and len(cur_texts) >= max_docs)
+        ):
             batches.append((cur_texts, cur_metas, cur_ids))
             cur_texts, cur_metas, cur_ids = [], [], []
             cur_tokens = 0
@@ -67,6 +108,43 @@ def _build_token_batches(
     return batches
 
 
+def _corpus_hash(ids: list[str], documents_text: list[str]) -> str:
+    """Short fingerprint of the indexed documents, used to name persisted collections."""
+    digest = hashlib.sha1()
+    for doc_id, text in sorted(zip(ids, documents_text, strict=True)):
+        digest.update(doc_id.encode())
+        digest.update(b"\0")
+        digest.update(text.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class SharedEmbedder:
+    """
+    Embeds search queries with ChromaDB's default model, memoizing recent ones.
+
+    Hybrid RAG searches both AbstractRAG and NodeRAG with the same question;
+    sharing one embedder means the query is only embedded once.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        from chromadb.utils import embedding_functions
+
+        # Same model the collections use when no embedding function is given
+        self._embedding_fn = embedding_functions.DefaultEmbeddingFunction()
+        self.embed = lru_cache(maxsize=maxsize)(self._embed)
+
+    def _embed(self, text: str) -> list[float]:
+        return self._embedding_fn([text])[0]
+
+
+def _query_input(embedder: SharedEmbedder | None, query: str) -> dict[str, list]:
+    """Keyword arguments for collection.query(): a shared embedding or the raw text."""
+    if embedder is None:
+        return {"query_texts": [query]}
+    return {"query_embeddings": [embedder.embed(query)]}
+
+
 @dataclass
 class AbstractDocument:
     """Represents a PubMed abstract as a RAG document"""
@@ -81,17 +159,36 @@ class AbstractDocument:
 class AbstractRAG:
     """RAG system for indexing and retrieving PubMed abstracts"""
 
-    def __init__(self, llm_client, collection_name: str = "abstracts"):
+    def __init__(
+        self,
+        llm_client,
+        collection_name: str = "abstracts",
+        retrieval_profile: Literal["fast", "balanced", "recall-max"] | None = None,
+        persist_directory: str | None = None,
+        embedder: SharedEmbedder | None = None,
+    ):
         """
         Initialize the RAG system.
 
         Args:
             llm_client: LLM client with embeddings capability
             collection_name: Name for the vector database collection
+            retrieval_profile: Optional HNSW preset from RETRIEVAL_PROFILES
+            persist_directory: If given, embeddings are stored on disk there and
+                an unchanged set of abstracts is not embedded again
+            embedder: Optional SharedEmbedder used to embed search queries
         """
+        if retrieval_profile is not None and retrieval_profile not in RETRIEVAL_PROFILES:
+            raise ValueError(f"Unknown retrieval profile: {retrieval_profile}")
+
         self.llm_client = llm_client
         self.collection_name = collection_name
+        self.retrieval_profile = retrieval_profile
+        self.persist_directory = persist_directory
+        self.embedder = embedder
         self.documents: dict[str, AbstractDocument] = {}
+        # Bumped whenever the document set changes, so callers can cache per corpus
+        self.documents_version = 0
         self.collection = None
         self._initialized = False
 
@@ -99,14 +196,16 @@ class AbstractRAG:
             import chromadb
             from chromadb.config import Settings
 
-            # Initialize ChromaDB with ephemeral storage (in-memory for now)
-            # Use a fresh client for each RAG instance to avoid cross-session pollution
-            self.client = chromadb.Client(
-                Settings(
-                    anonymized_telemetry=False,
-                    allow_reset=True,
-                )
+            settings = Settings(
+                anonymized_telemetry=False,
+                allow_reset=True,
             )
+            if persist_directory is not None:
+                self.client = chromadb.PersistentClient(path=persist_directory, settings=settings)
+            else:
+                # Initialize ChromaDB with ephemeral storage (in-memory for now)
+                # Use a fresh client for each RAG instance to avoid cross-session pollution
+                self.client = chromadb.Client(settings)
 
             # Standardize to ChromaDB default embeddings for all providers.
             # This avoids provider-specific embedding endpoint compatibility issues.
@@ -134,23 +233,24 @@ class AbstractRAG:
             return 0
 
         try:
-            # Reset collection if exists
-            if self._initialized:
+            # Reset collection if exists (persisted collections are keyed by
+            # corpus below, so they are kept for reuse)
+            if self._initialized and self.persist_directory is None:
                 self.client.reset()
 
-            # Create new collection
-            self.collection = self.client.get_or_create_collection(
-                name=self.collection_name,
-                metadata={"description": "PubMed abstracts for RAG"},
-                embedding_function=self.embedding_fn,
-            )
-
             # Prepare documents for indexing
             documents_text = []
             metadatas = []
             ids = []
+            seen_pmids = set()
 
             for doc in abstracts:
+                # A PMID can be collected more than once (e.g. from several
+                # edges); embed it once, as Chroma rejects duplicate IDs anyway
+                if doc.pmid in seen_pmids:
+                    continue
+                seen_pmids.add(doc.pmid)
+
                 # Combine title and abstract for better context
                 full_text = f"{doc.title}\n\n{doc.abstract}"
                 documents_text.append(full_text)
@@ -170,14 +270,48 @@ class AbstractRAG:
                 # Store full document for retrieval
                 self.documents[doc.pmid] = doc
 
+            self.documents_version += 1
+
+            num_duplicates = len(abstracts) - len(ids)
+            if num_duplicates:
+                logger.info(f"Skipped {num_duplicates} duplicate abstract(s)")
+                if progress_callback:
+                    progress_callback(f"Skipped {num_duplicates} duplicate abstract(s)")
+
+            metadata = {"description": "PubMed abstracts for RAG"}
+            if self.retrieval_profile is not None:
+                metadata.update(RETRIEVAL_PROFILES[self.retrieval_profile])
+
+            collection_name = self.collection_name
+            if self.persist_directory is not None:
+                collection_name = f"{collection_name}-{_corpus_hash(ids, documents_text)}"
+
+            # Create new collection
+            self.collection = self.client.get_or_create_collection(
+                name=collection_name,
+                metadata=metadata,
+                embedding_function=self.embedding_fn,
+            )
+
+            if self.persist_directory is not None and self.collection.count() == len(ids):
+                self._initialized = True
+                logger.info(f"Reusing persisted embeddings for {len(ids)} abstracts")
+                if progress_callback:
+                    progress_callback(f"✅ Loaded {len(ids)} indexed abstracts")
+                return len(ids)
+
             if progress_callback:
-                progress_callback(f"Indexing {len(abstracts)} abstracts...")
+                progress_callback(f"Indexing {len(ids)} abstracts...")
 
             # Split into token-aware batches to respect the 300k tokens/request limit.
-            batches = _build_token_batches(documents_text, metadatas, ids)
+            # Chroma also rejects add() calls above its max batch size, which
+            # many short abstracts can reach before the token limit.
+            batches = _build_token_batches(
+                documents_text, metadatas, ids, max_docs=_max_batch_size(self.client)
+            )
             total_batches = len(batches)
             logger.info(
-                f"Splitting {len(abstracts)} abstracts into {total_batches} batch(es) "
+                f"Splitting {len(ids)} abstracts into {total_batches} batch(es) "
                 f"(max {_MAX_TOKENS_PER_BATCH:,} tokens each)"
             )
 
@@ -187,7 +321,13 @@ class AbstractRAG:
                         f"Sending batch {batch_idx}/{total_batches} "
                         f"({len(batch_texts)} docs) to vector store..."
                     )
-                    self.collection.add(
+                    # upsert() lets a partially written persisted collection be completed
+                    write = (
+                        self.collection.add
+                        if self.persist_directory is None
+                        else self.collection.upsert
+                    )
+                    write(
                         documents=batch_texts,
                         metadatas=batch_metas,
                         ids=batch_ids,
@@ -201,14 +341,12 @@ class AbstractRAG:
                 raise e
 
             self._initialized = True
-            logger.info(
-                f"Indexed {len(abstracts)} abstracts successfully in {total_batches} batch(es)"
-            )
+            logger.info(f"Indexed {len(ids)} abstracts successfully in {total_batches} batch(es)")
 
             if progress_callback:
-                progress_callback(f"✅ Indexed {len(abstracts)} abstracts")
+                progress_callback(f"✅ Indexed {len(ids)} abstracts")
 
-            return len(abstracts)
+            return len(ids)
 
         except Exception as e:
             logger.error(f"Error indexing abstracts: {e}")
@@ -230,7 +368,13 @@ class AbstractRAG:
             return []
 
         try:
-            results = self.collection.query(query_texts=[query], n_results=top_k)
+            # Chroma already returns the nearest neighbours in ranked order from its
+            # HNSW index, so only distances are fetched: the PMID comes from the id
+            # and the text from self.documents.
+            n_results = min(top_k, len(self.documents)) if self.documents else top_k
+            results = self.collection.query(
+                **_query_input(self.embedder, query), n_results=n_results, include=["distances"]
+            )
 
             # Extract PMIDs and scores
             pmid_scores = []
@@ -265,20 +409,16 @@ class AbstractRAG:
         if not results:
             return "No relevant abstracts found.", []
 
-        context_parts = []
-        pmids_used = []
-
-        for pmid, score in results:
-            if pmid in self.documents:
-                doc = self.documents[pmid]
-                context_parts.append(
-                    f"PMID: {pmid} (Relevance: {score:.2f})\n"
-                    f"Title: {doc.title}\n"
-                    f"Abstract: {doc.abstract}\n"
-                )
-                pmids_used.append(pmid)
+        documents = self.documents
+        hits = [(pmid, score, documents[pmid]) for pmid, score in results if pmid in documents]
 
-        context = "\n---\n\n".join(context_parts)
+        context = "\n---\n\n".join(
+            f"PMID: {pmid} (Relevance: {score:.2f})\n"
+            f"Title: {doc.title}\n"
+            f"Abstract: {doc.abstract}\n"
+            for pmid, score, doc in hits
+        )
+        pmids_used = [pmid for pmid, _, _ in hits]
         return context, pmids_used
 
     def get_document(self, pmid: str) -> AbstractDocument | None:
@@ -291,9 +431,11 @@ class AbstractRAG:
 
     def clear(self):
         """Clear the RAG system"""
-        if self.client:
+        # Persisted embeddings are kept so they can be reused
+        if self.client and self.persist_directory is None:
             self.client.reset()
         self.documents.clear()
+        self.documents_version += 1
         self.collection = None
         self._initialized = False
         logger.info("RAG system cleared")
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import logging
 import sys
+import time
+from collections import OrderedDict
 from datetime import datetime
 from uuid import uuid4
 
@@ -16,6 +18,38 @@ def generate_stable_id(input_str: str):
     return hashlib.sha1(input_str.encode("utf-8")).hexdigest()
 
 
+class TTLCache:
+    """A small LRU cache whose entries also expire *ttl* seconds after insertion."""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
 def config_logger(is_debug: bool, filename: str | None = None):
     handlers = [logging.StreamHandler(stream=sys.stdout)]
 
@@ -480,6 +480,7 @@ def test_chat_cli_one_shot_uses_hybrid_rag_session(monkeypatch: pytest.MonkeyPat
         mock.patch("netmedex.graph.load_graph", return_value=fake_graph),
         mock.patch("netmedex.cli._init_cli_llm_client", return_value=fake_llm_client) as mock_init,
         mock.patch("netmedex.rag.AbstractRAG", return_value=fake_rag),
+        mock.patch("netmedex.rag.SharedEmbedder") as mock_embedder_cls,
         mock.patch("netmedex.node_rag.NodeRAG") as mock_node_rag_cls,
         mock.patch("netmedex.graph_rag.GraphRetriever") as mock_graph_retriever_cls,
         mock.patch("netmedex.chat.ChatSession", return_value=fake_chat_session) as mock_chat_cls,
@@ -487,7 +488,9 @@ def test_chat_cli_one_shot_uses_hybrid_rag_session(monkeypatch: pytest.MonkeyPat
         main()
 
         mock_init.assert_called_once()
-        mock_node_rag_cls.assert_called_once_with(fake_llm_client)
+        mock_node_rag_cls.assert_called_once_with(
+            fake_llm_client, embedder=mock_embedder_cls.return_value
+        )
         mock_graph_retriever_cls.assert_called_once()
         mock_chat_cls.assert_called_once()
         fake_chat_session.send_message.assert_called_once_with(
@@ -0,0 +1,75 @@
+import gzip
+import json
+
+import pytest
+
+from netmedex.cytoscape_html_template import (
+    HTML_TEMPLATE,
+    _logo,
+    render,
+    render_bytes,
+    render_stream,
+    render_to_dir,
+)
+
+
+def test_render_substitutes_placeholders():
+    elements = json.dumps([{"data": {"id": "n1", "label": "__LOGO__ {x}"}}])
+
+    html = render(elements)
+
+    assert elements in html
+    assert '<option value="preset" selected>' in html
+    assert "__CYTOSCAPE_JS__" not in html
+    # CSS/JS braces are kept as-is, not doubled for str.format
+    assert "{{" not in HTML_TEMPLATE
+
+
+def test_render_inlines_logo():
+    html = render("[]")
+
+    assert "__LOGO__" not in html
+    assert 'src="data:image/png;base64,iVBORw0KGgo' in html
+
+
+def test_render_to_dir_writes_external_data(tmp_path):
+    elements = [{"data": {"id": "n1"}}]
+
+    html_path = render_to_dir(tmp_path, elements)
+
+    html = html_path.read_text()
+    assert '<script src="graph.js"></script>' in html
+    assert "const elements = window.NETMEDEX_ELEMENTS;" in html
+    graph_js = (tmp_path / "graph.js").read_text()
+    assert json.loads(graph_js.split(" = ", 1)[1].rstrip(";\n")) == elements
+
+
+def test_render_stream_matches_render(tmp_path):
+    elements = json.dumps([{"data": {"id": "n1"}}])
+    path = tmp_path / "network.html.gz"
+
+    with gzip.open(path, "wt") as f:
+        render_stream(f, elements)
+
+    with gzip.open(path, "rt") as f:
+        assert f.read() == render(elements)
+
+
+def test_render_stream_rejects_empty_chunks(tmp_path):
+    with open(tmp_path / "network.html", "w") as f, pytest.raises(ValueError):
+        render_stream(f, iter([]))
+
+
+def test_rendered_template_is_minified():
+    html = render("[]")
+
+    assert len(html) - len(_logo()) < len(HTML_TEMPLATE)
+    assert not any(line[:1].isspace() for line in html.splitlines())
+    assert "// Update Layout" not in html
+    assert "https://pubmed.ncbi.nlm.nih.gov/" in html
+
+
+def test_render_bytes_matches_render():
+    elements = json.dumps([{"data": {"id": "n1", "label": "Café"}}], ensure_ascii=False)
+
+    assert render_bytes(elements.encode("utf-8")) == render(elements).encode("utf-8")
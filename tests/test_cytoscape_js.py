@@ -0,0 +1,86 @@
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from netmedex.cytoscape_js import (
+    _extract_primary_relation,
+    create_cytoscape_js,
+    save_as_html,
+    save_as_json,
+)
+from netmedex.graph import PubTatorGraphBuilder
+from netmedex.pubtator_parser import PubTatorIO
+
+
+@pytest.fixture(scope="module")
+def graph(data_dir: Path):
+    builder = PubTatorGraphBuilder(node_type="all")
+    builder.add_collection(PubTatorIO.parse(data_dir / "6_nodes_3_clusters_mesh.pubtator"))
+    return builder.build(weighting_method="freq", edge_weight_cutoff=0)
+
+
+def test_save_as_json_round_trip(graph, tmp_path):
+    path = tmp_path / "graph.json"
+
+    save_as_json(graph, path)
+
+    exported = json.loads(path.read_bytes())
+    assert exported == json.loads(json.dumps(create_cytoscape_js(graph, style="dash")))
+
+
+def test_save_as_html_embeds_elements(graph, tmp_path):
+    path = tmp_path / "graph.html"
+
+    save_as_html(graph, path)
+
+    match = re.search(r"const elements = (.*?);\n", path.read_text())
+    elements = json.loads(match.group(1))
+    assert len(elements) == graph.number_of_nodes() + graph.number_of_edges()
+
+
+def test_edge_relations_are_json_lists(graph):
+    edges = create_cytoscape_js(graph, style="dash")["elements"]["edges"]
+
+    for edge in edges:
+        assert all(isinstance(rels, list) for rels in edge["data"]["relations"].values())
+    json.dumps(edges)
+
+
+def test_primary_relation_has_highest_mean_confidence():
+    edge_attr = {
+        "confidences": {
+            "1": {"inhibits": 0.9, "associated_with": 0.4},
+            "2": {"inhibits": 0.5},
+            "3": {"associated_with": 0.8},
+        }
+    }
+
+    relation, confidence = _extract_primary_relation(edge_attr)
+
+    assert relation == "inhibits"
+    assert confidence == pytest.approx(0.7)
+
+
+def test_edges_of_skipped_nodes_are_dropped(graph):
+    G = graph.copy()
+    node = next(iter(G.nodes))
+    del G.nodes[node]["pmids"]
+
+    elements = create_cytoscape_js(G, style="dash")["elements"]
+
+    assert len(elements["nodes"]) == G.number_of_nodes() - 1
+    assert len(elements["edges"]) == G.number_of_edges() - G.degree(node)
+
+
+def test_primary_relation_prefers_relations_over_co_mention():
+    only_co_mention = {"relations": {"1": {"co-mention"}, "2": ["co-mention"]}}
+    mixed = {"relations": {"1": {"co-mention"}, "2": "inhibits"}}
+
+    assert _extract_primary_relation(only_co_mention) == ("co-mention", 0.5)
+    assert _extract_primary_relation(mixed) == ("inhibits", 0.5)
+    assert _extract_primary_relation({"type": "community", "pmids": {"1"}}) == (
+        "interacts_with",
+        0.0,
+    )
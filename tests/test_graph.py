@@ -4,7 +4,9 @@ from typing import Literal
 
 import pytest
 
-from netmedex.graph import PubTatorGraphBuilder
+from netmedex.graph import ZSTD_MAGIC, PubTatorGraphBuilder, load_graph, save_graph
+from netmedex.pubtator_data import PubTatorArticle
+from netmedex.pubtator_graph_data import PubTatorEdge
 from netmedex.pubtator_parser import PubTatorIO
 
 
@@ -19,6 +21,7 @@ def _build_graph(
     edge_weight_cutoff: int = 0,
     community: bool = False,
     max_edges: int = 0,
+    community_engine: Literal["networkx", "igraph"] = "networkx",
 ):
     collection = _load_collection(pubtator_file)
     builder = PubTatorGraphBuilder(node_type=node_type)
@@ -28,6 +31,7 @@ def _build_graph(
         edge_weight_cutoff=edge_weight_cutoff,
         community=community,
         max_edges=max_edges,
+        community_engine=community_engine,
     )
 
 
@@ -111,3 +115,96 @@ def test_edge_pmid_list(paths):
     expected = {"34205807", "34895069", "35883435"}
 
     assert pmid_set == expected
+
+
+def test_add_edges_merges_semantic_metadata():
+    builder = PubTatorGraphBuilder(node_type="all")
+    builder._add_edges(
+        [
+            PubTatorEdge("A", "B", "1", "co-mention"),
+            PubTatorEdge("A", "B", "1", "inhibits", confidence=0.9, evidence="A inhibits B"),
+            PubTatorEdge("A", "B", "2", "treats", confidence=0.5),
+            PubTatorEdge("B", "A", "3", "binds"),
+        ]
+    )
+
+    assert builder.graph.number_of_edges() == 1
+    edge_data = builder.graph.edges["A", "B"]
+    assert edge_data["relations"] == {
+        "1": {"co-mention", "inhibits"},
+        "2": {"treats"},
+        "3": {"binds"},
+    }
+    assert edge_data["confidences"] == {"1": {"inhibits": 0.9}, "2": {"treats": 0.5}}
+    assert edge_data["evidences"] == {"1": {"inhibits": "A inhibits B"}}
+
+
+def test_add_article_without_annotations():
+    builder = PubTatorGraphBuilder(node_type="all")
+    article = PubTatorArticle(
+        pmid="1",
+        date=None,
+        journal=None,
+        doi=None,
+        title="No entities here",
+        abstract=None,
+        annotations=[],
+        relations=[],
+    )
+
+    assert builder.add_article(article) == {}
+    assert builder.num_articles == 1
+    assert builder.graph.graph["pmid_title"] == {"1": "No entities here"}
+    assert builder.graph.number_of_nodes() == 0
+
+
+def _community_partition(G):
+    partition = {}
+    for node, parent in G.nodes(data="parent"):
+        if parent is not None:
+            partition.setdefault(parent, set()).add(node)
+    return sorted(sorted(members) for members in partition.values())
+
+
+def test_igraph_engine_falls_back_to_networkx(paths, monkeypatch):
+    monkeypatch.setattr("netmedex.graph.ig", None)
+    G_nx = _build_graph(paths["simple"], community=True)
+    G_fallback = _build_graph(paths["simple"], community=True, community_engine="igraph")
+
+    assert G_fallback.graph["num_communities"] == G_nx.graph["num_communities"]
+    assert _community_partition(G_fallback) == _community_partition(G_nx)
+
+
+def test_igraph_engine_communities(paths):
+    pytest.importorskip("igraph")
+    G = _build_graph(paths["simple"], community=True, community_engine="igraph")
+
+    num_communities = G.graph["num_communities"]
+    assert num_communities > 0
+    assert len(_community_partition(G)) == num_communities
+
+
+def test_graphtool_layout_falls_back_to_networkx(paths, monkeypatch):
+    monkeypatch.setattr("netmedex.graph.gt", None)
+    collection = _load_collection(paths["simple"])
+    builder = PubTatorGraphBuilder(node_type="all")
+    builder.add_collection(collection)
+    G = builder.build(community=False, layout_engine="graphtool")
+
+    assert all(pos is not None for _, pos in G.nodes(data="pos"))
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_save_and_load_pickle(paths, tempdir, compressed):
+    if compressed:
+        pytest.importorskip("zstandard")
+
+    G = _build_graph(paths["simple"])
+    savepath = tempdir / ("graph.pkl.zst" if compressed else "graph.pkl")
+    save_graph(G, savepath, "pickle")
+
+    assert (savepath.read_bytes()[:4] == ZSTD_MAGIC) is compressed
+    G_loaded = load_graph(savepath)
+    assert G_loaded.graph == G.graph
+    assert list(G_loaded.nodes(data="pmids")) == list(G.nodes(data="pmids"))
+    assert list(G_loaded.edges(data=True)) == list(G.edges(data=True))
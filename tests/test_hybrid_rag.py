@@ -1,4 +1,6 @@
 import networkx as nx
+import pytest
+
 from netmedex.graph_rag import GraphRetriever
 
 
@@ -33,6 +35,85 @@ def test_graph_retriever():
     assert "inhibits" in context
 
 
+def _name_graph():
+    G = nx.Graph()
+    G.add_node("MESH:D003920", name="Diabetes Mellitus", type="Disease")
+    G.add_node("MESH:D003924", name="Diabetes Mellitus, Type 2", type="Disease")
+    G.add_node("3630", name="INS", type="Gene")
+    G.add_node("MESH:D008687", name="Metformin", type="Chemical")
+    return G
+
+
+@pytest.mark.parametrize("use_automaton", [True, False])
+def test_find_relevant_nodes_matches_all_contained_names(monkeypatch, use_automaton):
+    if use_automaton:
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr("netmedex.graph_rag.ahocorasick", None)
+    retriever = GraphRetriever(_name_graph())
+
+    nodes = retriever.find_relevant_nodes("Does metformin help diabetes mellitus, type 2?")
+
+    # Overlapping names are all matched
+    assert set(nodes) == {"MESH:D008687", "MESH:D003920", "MESH:D003924"}
+
+
+def test_subgraph_context_is_memoized_by_node_set(mocker):
+    G = nx.Graph()
+    G.add_node("1", name="GeneA", type="Gene")
+    G.add_node("2", name="GeneB", type="Gene")
+    G.add_edge("1", "2", relations={"123": {"activates"}}, edge_weight=0.9)
+    retriever = GraphRetriever(G)
+
+    context = retriever.get_subgraph_context(["1", "2"])
+    find_connection = mocker.spy(retriever, "_find_connection")
+
+    assert retriever.get_subgraph_context(["2", "1"]) == context
+    assert find_connection.call_count == 0
+    assert retriever.get_subgraph_context(["1", "2"], max_hops=1) == context
+    assert find_connection.call_count == 1
+
+
+def test_find_connection_respects_max_hops():
+    G = nx.path_graph(["1", "2", "3", "4"])
+    G.add_edge("1", "5")
+    retriever = GraphRetriever(G)
+
+    assert retriever._find_connection("1", "4", 3) == ["1", "2", "3", "4"]
+    assert retriever._find_connection("4", "1", 3) == ["4", "3", "2", "1"]
+    assert retriever._find_connection("1", "4", 2) is None
+    assert retriever._find_connection("1", "1", 2) == ["1"]
+
+    G.add_node("6")
+    assert retriever._find_connection("1", "6", 5) is None
+    assert retriever._find_connection("1", "6") is None
+
+
+def test_subgraph_context_reports_long_paths_by_default():
+    G = nx.path_graph(["1", "2", "3", "4"])
+    retriever = GraphRetriever(G)
+
+    # A 3-hop pair is still connected unless a limit is passed
+    assert retriever.get_subgraph_context(["1", "4"]).endswith(
+        "Path: 1 --[associated]--> 2 | 2 --[associated]--> 3 | 3 --[associated]--> 4"
+    )
+    assert retriever._find_connection("1", "4") == ["1", "2", "3", "4"]
+    assert "within 2 hops" in retriever.get_subgraph_context(["1", "4"], max_hops=2)
+
+
+def test_invalidate_picks_up_graph_changes():
+    G = _name_graph()
+    retriever = GraphRetriever(G)
+    assert retriever.get_subgraph_context(["3630"]).startswith("Entity: INS (Gene)")
+
+    G.add_node("7124", name="TNF", type="Gene")
+    G.add_edge("3630", "7124", relations={"1": {"associate"}}, edge_weight=1.0)
+    retriever.invalidate()
+
+    assert retriever.find_relevant_nodes("tnf") == ["7124"]
+    assert "TNF (Gene)" in retriever.get_subgraph_context(["3630"])
+
+
 if __name__ == "__main__":
     test_graph_retriever()
     print("\n✅ GraphRetriever Text Passed!")
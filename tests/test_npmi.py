@@ -0,0 +1,33 @@
+import pytest
+
+from netmedex.npmi import (
+    normalized_pointwise_mutual_information,
+    normalized_pointwise_mutual_information_array,
+)
+
+
+def test_npmi_array_matches_scalar():
+    N = 50
+    cases = [
+        (10, 12, 5),
+        (2, 2, 2),
+        (1, 30, 1),  # below the occurrence threshold
+        (0, 10, 3),  # invalid count
+        (10, 10, 0),  # never co-mentioned
+        (50, 50, 50),  # co-mentioned in every article
+        (8.46, 2, 3.5),  # weighted counts
+    ]
+    n_x, n_y, n_xy = zip(*cases, strict=True)
+
+    npmis = normalized_pointwise_mutual_information_array(n_x, n_y, n_xy, N=N, n_threshold=2)
+
+    expected = [
+        normalized_pointwise_mutual_information(x, y, xy, N=N, n_threshold=2) for x, y, xy in cases
+    ]
+    assert npmis == pytest.approx(expected)
+
+
+def test_npmi_array_without_articles():
+    assert normalized_pointwise_mutual_information_array([1], [1], [1], N=0, n_threshold=2) == [
+        0.0
+    ]
@@ -1,3 +1,4 @@
+import pickle
 import sys
 import unittest
 from pathlib import Path
@@ -7,8 +8,9 @@ import networkx as nx
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from netmedex.chat import ChatSession
-from netmedex.rag import AbstractDocument, AbstractRAG
+from netmedex.chat import ChatMessage, ChatSession
+from netmedex.node_rag import NodeRAG
+from netmedex.rag import AbstractDocument, AbstractRAG, SharedEmbedder, _build_token_batches
 
 
 class TestRAGChat(unittest.TestCase):
@@ -50,6 +52,69 @@ class TestRAGChat(unittest.TestCase):
         # Verify collection.add was called
         self.assertTrue(self.mock_collection.add.called)
 
+    def test_token_batches_respect_max_docs(self):
+        texts = ["alpha beta", "gamma delta", "epsilon zeta"]
+        with patch("netmedex.rag._get_encoding", return_value=None):
+            batches = _build_token_batches(texts, [{}, {}, {}], ["1", "2", "3"], max_docs=2)
+
+        self.assertEqual([batch_ids for _, _, batch_ids in batches], [["1", "2"], ["3"]])
+
+    def test_persisted_index_is_reused_with_retrieval_profile(self):
+        with patch("chromadb.PersistentClient") as mock_chroma:
+            collection = MagicMock()
+            collection.count.return_value = len(self.docs)
+            mock_chroma.return_value.get_or_create_collection.return_value = collection
+            rag = AbstractRAG(
+                self.llm_client, retrieval_profile="balanced", persist_directory="unused"
+            )
+            with patch("netmedex.rag._get_encoding", return_value=None):
+                self.assertEqual(rag.index_abstracts(self.docs), len(self.docs))
+
+        kwargs = mock_chroma.return_value.get_or_create_collection.call_args.kwargs
+        self.assertEqual(kwargs["metadata"]["hnsw:search_ef"], 64)
+        self.assertTrue(kwargs["name"].startswith("abstracts-"))
+        self.assertFalse(collection.add.called)
+        self.assertFalse(collection.upsert.called)
+        self.assertFalse(mock_chroma.return_value.reset.called)
+        self.assertEqual(set(rag.documents), {"123456", "789012"})
+
+    def test_shared_embedder_embeds_query_once(self):
+        with patch("chromadb.utils.embedding_functions.DefaultEmbeddingFunction") as mock_ef:
+            mock_ef.return_value.side_effect = lambda texts: [[0.1, 0.2] for _ in texts]
+            embedder = SharedEmbedder()
+
+        with patch("chromadb.Client"):
+            node_rag = NodeRAG(self.llm_client, embedder=embedder)
+        node_rag.collection = MagicMock()
+        node_rag.collection.query.return_value = {"ids": [], "distances": []}
+        node_rag._initialized = True
+
+        self.rag.embedder = embedder
+        self.rag._initialized = True
+        self.mock_collection.query.return_value = {"ids": [], "distances": []}
+        self.rag.collection = self.mock_collection
+
+        self.rag.search("remdesivir")
+        node_rag.search_nodes("remdesivir")
+
+        self.assertEqual(mock_ef.return_value.call_count, 1)
+        for collection in (self.mock_collection, node_rag.collection):
+            kwargs = collection.query.call_args.kwargs
+            self.assertEqual(kwargs["query_embeddings"], [[0.1, 0.2]])
+            self.assertNotIn("query_texts", kwargs)
+
+    def test_duplicate_pmids_are_indexed_once(self):
+        with patch("netmedex.rag._get_encoding", return_value=None):
+            indexed = self.rag.index_abstracts(self.docs + self.docs[:1])
+
+        self.assertEqual(indexed, 2)
+        added_ids = [
+            doc_id
+            for call in self.mock_collection.add.call_args_list
+            for doc_id in call.kwargs["ids"]
+        ]
+        self.assertEqual(added_ids, ["pmid_123456", "pmid_789012"])
+
     def test_citation_formatting(self):
         # Populate rag.documents because ChatSession optimization uses all docs if count <= 20
         # effectively bypassing get_context()
@@ -74,6 +139,122 @@ class TestRAGChat(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertIn("123456", result["sources"])
 
+    def test_graph_context_is_included_in_prompt(self):
+        self.rag.documents["123456"] = self.docs[0]
+        graph_retriever = MagicMock()
+        graph_retriever.find_relevant_nodes.return_value = ["remdesivir"]
+        graph_retriever.get_subgraph_context.return_value = "Remdesivir --[inhibits]--> SARS-CoV-2"
+        self.llm_client.chat_completion_text.return_value = "Yes [PMID:123456]."
+
+        session = ChatSession(self.rag, self.llm_client, graph_retriever=graph_retriever)
+        result = session.send_message("Is Remdesivir effective?")
+
+        self.assertTrue(result["success"])
+        prompt = self.llm_client.chat_completion_text.call_args.kwargs["messages"][-1]["content"]
+        self.assertIn("Remdesivir --[inhibits]--> SARS-CoV-2", prompt)
+        self.assertIn("Abstract: Remdesivir inhibits", prompt)
+
+    def test_repeated_question_reuses_cached_response(self):
+        self.rag.index_abstracts(self.docs[:1])
+        self.llm_client.chat_completion_text.return_value = "Yes [PMID:123456]."
+        session = ChatSession(self.rag, self.llm_client)
+
+        first = session.send_message("Is Remdesivir effective?")
+        second = session.send_message("Is Remdesivir effective?")
+
+        self.assertEqual(self.llm_client.chat_completion_text.call_count, 1)
+        self.assertEqual(second["message"], first["message"])
+        self.assertEqual(second["sources"], ["123456"])
+        self.assertIsNot(second["assistant_msg"], first["assistant_msg"])
+        self.assertEqual(len(session.history), 4)
+
+        # Follow-ups depend on the conversation, so they always reach the LLM
+        session.send_message("Tell me more")
+        session.send_message("Tell me more")
+        self.assertEqual(self.llm_client.chat_completion_text.call_count, 3)
+
+        # A different corpus must not reuse the cached reply
+        self.rag.index_abstracts(self.docs)
+        session.send_message("Is Remdesivir effective?")
+        self.assertEqual(self.llm_client.chat_completion_text.call_count, 4)
+
+    def test_stream_message_yields_chunks_and_returns_result(self):
+        self.rag.documents["123456"] = self.docs[0]
+        self.llm_client.chat_completion_stream.return_value = iter(
+            ["Remdesivir is ", "effective ", "[PMID:123456]."]
+        )
+        session = ChatSession(self.rag, self.llm_client)
+
+        stream = session.stream_message("Is Remdesivir effective?")
+        chunks = []
+        while True:
+            try:
+                chunks.append(next(stream))
+            except StopIteration as stop:
+                result = stop.value
+                break
+
+        self.assertEqual(chunks, ["Remdesivir is ", "effective ", "[PMID:123456]."])
+        self.assertTrue(result["success"])
+        self.assertEqual(result["message"], "Remdesivir is effective [PMID:123456].")
+        self.assertEqual(result["sources"], ["123456"])
+        self.assertIs(session.history[-1], result["assistant_msg"])
+
+    def test_cited_sources_are_normalized(self):
+        sources = ChatSession._filter_cited_sources(
+            "See [PMID: 0123456] and PMID:42.", ["123456", 42, "789012"]
+        )
+        self.assertEqual(sources, ["123456", 42])
+        self.assertEqual(ChatSession._filter_cited_sources("No citations.", ["123456"]), [])
+
+    def test_all_documents_context_is_rebuilt_when_corpus_changes(self):
+        self.rag.documents["123456"] = self.docs[0]
+        session = ChatSession(self.rag, self.llm_client)
+
+        context, pmids = session._get_all_documents_context()
+        self.assertIs(session._get_all_documents_context()[0], context)
+        self.assertEqual(pmids, ["123456"])
+
+        self.rag.documents["789012"] = self.docs[1]
+        context, pmids = session._get_all_documents_context()
+        self.assertIn("Dexamethasone", context)
+        self.assertEqual(pmids, ["123456", "789012"])
+        self.assertEqual(session._get_all_documents_context(limit=1)[1], ["123456"])
+
+    def test_llm_history_window_is_bounded(self):
+        session = ChatSession(self.rag, self.llm_client, max_history=3)
+        for i in range(4):
+            session._append_history(ChatMessage(role="user", content=f"question {i}"))
+            session._append_history(ChatMessage(role="assistant", content=f"answer {i}"))
+
+        messages = session._build_messages("question 4", "context")
+
+        self.assertEqual(len(session.history), 8)
+        self.assertEqual([m["content"] for m in messages[1:-1]], ["question 3", "answer 3"])
+        self.assertIn("question 4", messages[-1]["content"])
+
+        stats = session.get_stats()
+        self.assertEqual((stats["user_messages"], stats["assistant_messages"]), (4, 4))
+        session.clear()
+        self.assertEqual(session.get_stats()["message_count"], 0)
+        self.assertEqual(session.get_stats()["user_messages"], 0)
+
+    def test_pickle_keeps_history_and_drops_services(self):
+        session = ChatSession(self.rag, self.llm_client, max_history=3)
+        session._append_history(ChatMessage(role="user", content="question"))
+        session._append_history(ChatMessage(role="assistant", content="answer", sources=["1"]))
+
+        restored = pickle.loads(pickle.dumps(session))
+
+        self.assertIsNone(restored.rag)
+        self.assertIsNone(restored.llm)
+        self.assertEqual(restored.get_history(), session.get_history())
+        self.assertEqual(restored.get_stats()["assistant_messages"], 1)
+        self.assertEqual(list(restored._llm_history), list(session._llm_history))
+
+        restored.attach(self.rag, self.llm_client)
+        self.assertIs(restored.rag, self.rag)
+
     def test_entity_listing_query_returns_full_mirna_list_from_graph(self):
         graph = nx.Graph()
         for i in range(1, 7):
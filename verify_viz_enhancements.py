@@ -56,7 +56,7 @@ def test_edge_enhancement():
     )
 
     # Create cytoscape edge
-    edge_data = create_cytoscape_edge(("n1", "n2", G.edges["n1", "n2"]), G)
+    edge_data = create_cytoscape_edge(("n1", "n2", G.edges["n1", "n2"]), G.nodes)
     data = edge_data["data"]
 
     print(f"Edge data: {json.dumps(data, indent=2)}")
@@ -185,9 +185,9 @@ def callbacks(app):
             raise dash.exceptions.PreventUpdate
 
         try:
-            import pickle
             from netmedex.chat import ChatSession
-            from netmedex.rag import AbstractDocument, AbstractRAG
+            from netmedex.graph import load_graph
+            from netmedex.rag import AbstractDocument, AbstractRAG, SharedEmbedder
             from webapp.llm import GEMINI_OPENAI_BASE_URL, OPENAI_BASE_URL, llm_client
 
             # Keep chat process LLM config aligned with current Advanced Settings.
@@ -246,8 +246,7 @@ def callbacks(app):
                     no_update,
                 )
 
-            with open(savepath["graph"], "rb") as f:
-                G = pickle.load(f)
+            G = load_graph(savepath["graph"])
 
             # Extract PMIDs and build abstract documents
             pmid_data = {}
@@ -310,13 +309,15 @@ def callbacks(app):
                 )
 
             # Initialize RAG system
-            rag_system = AbstractRAG(llm_client)
+            # Both retrievers are searched with the same question; embed it once
+            embedder = SharedEmbedder()
+            rag_system = AbstractRAG(llm_client, embedder=embedder)
             indexed_count = rag_system.index_abstracts(documents)
 
             # Initialize Node RAG System (New in v0.8)
             from netmedex.node_rag import NodeRAG, GraphNode
 
-            node_rag = NodeRAG(llm_client)
+            node_rag = NodeRAG(llm_client, embedder=embedder)
 
             # Index all nodes in the current graph
             graph_nodes = []
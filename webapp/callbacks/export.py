@@ -23,20 +23,19 @@ def callbacks(app):
     @app.callback(
         Output("export-html", "data"),
         Input("export-btn-html", "n_clicks"),
-        State("graph-layout", "value"),
         State("node-degree", "value"),
         State("graph-cut-weight", "value"),
         State("current-session-path", "data"),
         prevent_initial_call=True,
     )
-    def export_html(n_clicks, layout, node_degree, weight, savepath):
+    def export_html(n_clicks, node_degree, weight, savepath):
         if savepath is None:
             return
 
         G = rebuild_graph(
             node_degree, weight, format="html", with_layout=True, graph_path=savepath["graph"]
         )
-        save_as_html(G, savepath["html"], layout=layout)
+        save_as_html(G, savepath["html"])
         return dcc.send_file(savepath["html"], filename="output.html")
 
     @app.callback(
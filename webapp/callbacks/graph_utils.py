@@ -28,9 +28,9 @@ def rebuild_graph(
     # Recalculate edge weights and widths based on current method
     PubTatorGraphBuilder.recalculate_edge_weights(graph, weighting_method)
 
-    PubTatorGraphBuilder._remove_edges_by_weight(graph, edge_weight_cutoff=cut_weight)
-    PubTatorGraphBuilder._remove_edges_by_rank(graph, graph.graph.get("max_edges", 0))
-    PubTatorGraphBuilder._remove_isolated_nodes(graph)
+    PubTatorGraphBuilder._prune_graph(
+        graph, edge_weight_cutoff=cut_weight, max_edges=graph.graph.get("max_edges", 0)
+    )
     filter_node(graph, node_degree)
 
     if with_layout:
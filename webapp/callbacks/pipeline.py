@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import base64
 import logging
-import pickle
 import threading
 from queue import Queue
 
@@ -12,7 +11,7 @@ from dash import Input, Output, State, html, no_update
 
 from netmedex.cli_utils import load_pmids
 from netmedex.exceptions import EmptyInput, NoArticles, RetryableError, UnsuccessfulRequest
-from netmedex.graph import PubTatorGraphBuilder, save_graph
+from netmedex.graph import PubTatorGraphBuilder, load_graph, save_graph
 from netmedex.pubtator import PubTatorAPI
 from netmedex.pubtator_parser import PubTatorIO
 from netmedex.utils_threading import run_thread_with_error_notification
@@ -185,8 +184,7 @@ def callbacks(app):
                     f.write(graph_bytes)
 
                 # Load and validate
-                with open(savepath["graph"], "rb") as f:
-                    G = pickle.load(f)
+                G = load_graph(savepath["graph"])
 
                 if not isinstance(G, nx.Graph):
                     raise ValueError(
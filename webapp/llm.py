@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+# PEP 810 (Python 3.15+): defer loading the SDKs below until first use.
+# Ignored on older interpreters.
+__lazy_modules__ = ["openai", "requests"]
 
 import os
 import logging
+from collections.abc import Iterator
 from openai import OpenAI, OpenAIError
 import requests
 
@@ -126,6 +130,45 @@ class LLMClient:
         - All providers (OpenAI, Google/Gemini, and local LLMs) now use the OpenAI SDK
           via the initialized client for consistency and correct URL/header handling.
         """
+        kwargs = self._chat_completion_kwargs(messages, temperature, max_tokens, timeout)
+        if response_format:
+            kwargs["response_format"] = response_format
+
+        response = self.client.chat.completions.create(**kwargs)
+        content = response.choices[0].message.content
+        if content is None:
+            return ""
+        return str(content).strip()
+
+    def chat_completion_stream(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float = 0.1,
+        max_tokens: int = 200,
+        timeout: float = 180.0,
+    ) -> Iterator[str]:
+        """
+        Streaming variant of chat_completion_text.
+        - Yields text deltas as the model generates them instead of waiting
+          for the full completion.
+        """
+        kwargs = self._chat_completion_kwargs(messages, temperature, max_tokens, timeout)
+        kwargs["stream"] = True
+
+        for chunk in self.client.chat.completions.create(**kwargs):
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    def _chat_completion_kwargs(
+        self,
+        messages: list[dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        timeout: float,
+    ) -> dict:
         if not self.api_key:
             raise ValueError("LLM API key is not configured")
 
@@ -152,15 +195,7 @@ class LLMClient:
             "timeout": timeout,
         }
         kwargs[limit_param] = max_tokens
-        
-        if response_format:
-            kwargs["response_format"] = response_format
-
-        response = self.client.chat.completions.create(**kwargs)
-        content = response.choices[0].message.content
-        if content is None:
-            return ""
-        return str(content).strip()
+        return kwargs
 
     def translate_to_english(self, text: str) -> str:
         """